@@ -4,80 +4,139 @@ Complete pipeline with tabular display of results.
 Processes images and displays all metrics in an easy-to-pick format.
 """
 
-import json
 import sys
-from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import importlib.util
 
-# Import analysis modules
-import golden
+import numpy as np
 
-# Load golden.final module
-spec = importlib.util.spec_from_file_location("golden_final", "golden.final.py")
-golden_final = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(golden_final)
+from common import (TableColumn, build_header, csv_line, load_json, materialize, pct_to_float,
+                    scan_landmarks_dir, table_column)
+
+# Analysis modules, imported on first use so --help and CLI parsing stay light
+golden = None
+golden_final = None
+
+
+def _load_pipeline():
+    """Import golden and golden.final the first time the pipeline runs."""
+    global golden, golden_final
+    if golden is not None:
+        return
+    
+    # Import analysis modules
+    import golden as golden_module
+    
+    # Load golden.final module
+    spec = importlib.util.spec_from_file_location("golden_final", "golden.final.py")
+    final_module = importlib.util.module_from_spec(spec)
+    # Registered so its worker processes can find the module's functions
+    sys.modules[spec.name] = final_module
+    spec.loader.exec_module(final_module)
+    
+    golden, golden_final = golden_module, final_module
 
 
 def flatten_json(data: Dict, parent_key: str = '', sep: str = '.') -> Dict:
     """Flatten nested JSON structure with dot notation keys."""
-    items = []
-    for k, v in data.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        
-        if isinstance(v, dict):
-            # Special handling for metrics with 'value' field
-            if 'value' in v and isinstance(v['value'], (int, float, str)):
-                items.append((new_key + '.value', v['value']))
-            else:
-                items.extend(flatten_json(v, new_key, sep=sep).items())
-        elif isinstance(v, list):
-            # Handle lists - just take length or first few items
-            if v and isinstance(v[0], dict):
-                items.append((new_key + '.count', len(v)))
+    flat = {}
+    stack = [(data, parent_key)]
+    
+    # Walk nested dicts with an explicit stack instead of recursing per level
+    while stack:
+        current, prefix = stack.pop()
+        nested = []
+        for k, v in current.items():
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            
+            if isinstance(v, dict):
+                # Special handling for metrics with 'value' field
+                if 'value' in v and isinstance(v['value'], (int, float, str)):
+                    flat[new_key + '.value'] = v['value']
+                else:
+                    nested.append((v, new_key))
+            elif isinstance(v, list):
+                # Handle lists - just take length or first few items
+                if v and isinstance(v[0], dict):
+                    flat[new_key + '.count'] = len(v)
+                else:
+                    flat[new_key] = str(v[:3]) if len(v) > 3 else str(v)
             else:
-                items.append((new_key, str(v[:3]) if len(v) > 3 else str(v)))
-        else:
-            items.append((new_key, v))
+                flat[new_key] = v
+        
+        # Push in reverse so sections are visited in document order
+        stack.extend(reversed(nested))
     
-    return dict(items)
+    return flat
 
 
-def process_and_display(landmarks_dir: str = "landmarks", output_format: str = "table"):
-    """Process landmarks and display results in various formats."""
+# Dot-notation path paired with its pre-split key parts
+SplitPath = Tuple[str, Tuple[str, ...]]
+
+
+def split_paths(paths: Iterable[str]) -> List[SplitPath]:
+    """Split dot-notation paths once so lookups don't re-split per row."""
+    return [(path, tuple(path.split('.'))) for path in paths]
+
+
+def extract_paths(data: Dict, paths: Iterable[SplitPath]) -> Dict:
+    """Pull only the given pre-split paths out of nested JSON."""
+    out = {}
+    for path, parts in paths:
+        cur = data
+        for part in parts:
+            if not isinstance(cur, dict):
+                cur = None
+                break
+            cur = cur.get(part)
+        
+        # Leave absent paths (and containers) unset, as flatten_json would
+        if cur is not None and not isinstance(cur, (dict, list)):
+            out[path] = cur
+    return out
+
+
+def _collect_results(landmarks_dir: str = "landmarks",
+                     paths: Optional[Iterable[SplitPath]] = None) -> List[Dict]:
+    """Run the analysis pipeline once and return flattened results for display.
+    
+    Only the given paths are extracted; pass None to flatten every field.
+    """
     
     print("=" * 80)
     print("GOLDEN RATIO ANALYSIS - COMPLETE RESULTS")
     print("=" * 80)
     
-    landmark_path = Path(landmarks_dir)
-    landmark_files = list(landmark_path.glob("*.landmark"))
+    landmark_files, _, _ = scan_landmarks_dir(landmarks_dir)
     
     if not landmark_files:
         print(f"No .landmark files found in {landmarks_dir}")
-        return
+        return []
     
     print(f"\nProcessing {len(landmark_files)} files...")
     print("-" * 80)
     
     # Process files
+    _load_pipeline()
     golden.process_landmarks_directory(landmarks_dir)
     golden_final.process_all_golden_files(landmarks_dir)
     
-    # Collect all results
+    # Collect all results (rescan: the pipeline just wrote the final files)
     results = []
-    final_files = list(landmark_path.glob("*.golden.final.json"))
+    _, _, final_files = scan_landmarks_dir(landmarks_dir)
     
-    for file in sorted(final_files):
+    for file in final_files:
         try:
-            with open(file, 'r') as f:
-                data = json.load(f)
+            data = load_json(file)
             
             # Extract key fields for tabular display
             name = file.stem.replace('.golden.final', '')
             
             # Flatten the JSON for easy field access
-            flat_data = flatten_json(data)
+            if paths is None:
+                flat_data = flatten_json(data)
+            else:
+                flat_data = extract_paths(data, paths)
             
             # Add to results
             result = {'name': name}
@@ -90,98 +149,123 @@ def process_and_display(landmarks_dir: str = "landmarks", output_format: str = "
     
     if not results:
         print("No results to display")
-        return
     
-    # Display based on format
-    if output_format == "table":
-        display_table(results)
-    elif output_format == "detailed":
-        display_detailed(results)
-    elif output_format == "json_paths":
-        display_json_paths(results)
-    elif output_format == "csv":
-        display_csv(results)
-    else:
-        display_summary(results)
+    return results
+
+
+def process_and_display(landmarks_dir: str = "landmarks", output_format: str = "table"):
+    """Process landmarks and display results in various formats."""
+    results = _collect_results(landmarks_dir, _paths_for([output_format]))
+    if results:
+        DISPATCH.get(output_format, display_summary)(results)
+
+
+# Table specs: (flattened path, column label, width format spec)
+KEY_METRICS = [
+    ('name', 'Image', '15s'),
+    ('summary.facial_harmony_score', 'Harmony', '8s'),
+    ('summary.harmony_level', 'Level', '12s'),
+    ('symmetry.overall_score', 'Symmetry', '9s'),
+    ('symmetry.level', 'Sym Level', '12s'),
+    ('golden_ratio_alignment.overall_harmony', 'Golden Ratio', '25s'),
+    ('prominent_features.eyes.eye_spacing', 'Eye Space', '12s'),
+    ('prominent_features.nose.width', 'Nose Width', '10s'),
+    ('prominent_features.mouth.width', 'Mouth Width', '11s'),
+    ('proportions.face_shape.overall_shape', 'Face Shape', '15s'),
+    ('proportions.face_shape.jawline', 'Jawline', '15s'),
+]
+
+DETAILED_METRICS = [
+    ('name', 'Image', '15s'),
+    ('eyes.canthal_tilt_deg_L.value', 'L Eye Tilt', '11s'),
+    ('eyes.canthal_tilt_deg_R.value', 'R Eye Tilt', '11s'),
+    ('nose.alar_width_over_inter_eye.value', 'Nose/Eye', '9s'),
+    ('structure.face_height_over_width.value', 'H/W Ratio', '10s'),
+    ('golden_diagnostics.thirds_evenness.value', 'Thirds', '8s'),
+    ('golden_diagnostics.fifths_evenness.value', 'Fifths', '8s'),
+]
+
+# Select important fields for CSV
+CSV_FIELDS = [
+    'name',
+    'summary.facial_harmony_score',
+    'summary.harmony_level',
+    'symmetry.overall_score',
+    'symmetry.level',
+    'golden_ratio_alignment.overall_harmony',
+    'prominent_features.eyes.eye_spacing',
+    'prominent_features.nose.width',
+    'prominent_features.mouth.width',
+    'proportions.face_shape.overall_shape',
+    'eyes.canthal_tilt_deg_L.value',
+    'eyes.canthal_tilt_deg_R.value',
+    'nose.alar_width_over_inter_eye.value',
+    'structure.face_height_over_width.value',
+]
+
+# Extra fields read by the per-image detailed view
+DETAILED_VIEW_FIELDS = [
+    'overall_assessment',
+    'golden_ratio_alignment.best_alignment.feature',
+    'golden_ratio_alignment.best_alignment.deviation',
+]
+
+# Every flattened path a display format reads ('name' is set separately)
+NEEDED_PATHS = split_paths(sorted(
+    set(p for p, _, _ in KEY_METRICS)
+    .union(p for p, _, _ in DETAILED_METRICS)
+    .union(CSV_FIELDS, DETAILED_VIEW_FIELDS)
+    - {'name'}
+))
+
+
+def _paths_for(formats: List[str]) -> Optional[List[SplitPath]]:
+    """Return the paths the formats need, or None when every field is listed."""
+    return None if "json_paths" in formats else NEEDED_PATHS
+
+
+def _compile_spec(spec: List[Tuple[str, str, str]]) -> List[TableColumn]:
+    """Resolve each column's width ('15s' is 15) and cell formatter once, leaving a one-character gap."""
+    return [table_column(path, int(width[:-1]), '.2f', limit=int(width[:-1]) - 1)
+            for path, _, width in spec]
+
+
+_KEY_COLUMNS = _compile_spec(KEY_METRICS)
+_DETAILED_COLUMNS = _compile_spec(DETAILED_METRICS)
+
+# Labels never change, so each header/separator pair is rendered once
+_KEY_HEADER, _KEY_SEP = build_header((label, int(width[:-1])) for _, label, width in KEY_METRICS)
+_DETAILED_HEADER, _DETAILED_SEP = build_header(
+    (label, int(width[:-1])) for _, label, width in DETAILED_METRICS
+)
 
 
 def display_table(results: List[Dict]):
     """Display results in a comprehensive table format."""
     
-    # Key metrics to display
-    key_metrics = [
-        ('name', 'Image', '15s'),
-        ('summary.facial_harmony_score', 'Harmony', '8s'),
-        ('summary.harmony_level', 'Level', '12s'),
-        ('symmetry.overall_score', 'Symmetry', '9s'),
-        ('symmetry.level', 'Sym Level', '12s'),
-        ('golden_ratio_alignment.overall_harmony', 'Golden Ratio', '25s'),
-        ('prominent_features.eyes.eye_spacing', 'Eye Space', '12s'),
-        ('prominent_features.nose.width', 'Nose Width', '10s'),
-        ('prominent_features.mouth.width', 'Mouth Width', '11s'),
-        ('proportions.face_shape.overall_shape', 'Face Shape', '15s'),
-        ('proportions.face_shape.jawline', 'Jawline', '15s'),
-    ]
+    # Format both tables in one pass, splitting each row at the table boundary
+    split = len(_KEY_COLUMNS)
+    rows = materialize(results, _KEY_COLUMNS + _DETAILED_COLUMNS)
     
     # Print header
     print("\n" + "=" * 80)
     print("SUMMARY TABLE")
     print("=" * 80)
     
-    # Print column headers
-    header = ""
-    for path, label, width in key_metrics:
-        header += f"{label:{width}} "
-    print(header)
-    print("-" * len(header))
-    
-    # Print data rows
-    for r in results:
-        row = ""
-        for path, label, width in key_metrics:
-            value = r.get(path, 'N/A')
-            if value is None:
-                value = 'N/A'
-            elif isinstance(value, float):
-                value = f"{value:.2f}"
-            value = str(value)[:int(width[:-1])-1]  # Truncate to fit
-            row += f"{value:{width}} "
-        print(row)
+    # Emit the whole table with one write instead of a print per row
+    lines = [_KEY_HEADER, _KEY_SEP]
+    lines.extend("".join(row[:split]) for row in rows)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Additional metrics table
     print("\n" + "=" * 80)
     print("DETAILED METRICS")
     print("=" * 80)
     
-    detailed_metrics = [
-        ('name', 'Image', '15s'),
-        ('eyes.canthal_tilt_deg_L.value', 'L Eye Tilt', '11s'),
-        ('eyes.canthal_tilt_deg_R.value', 'R Eye Tilt', '11s'),
-        ('nose.alar_width_over_inter_eye.value', 'Nose/Eye', '9s'),
-        ('structure.face_height_over_width.value', 'H/W Ratio', '10s'),
-        ('golden_diagnostics.thirds_evenness.value', 'Thirds', '8s'),
-        ('golden_diagnostics.fifths_evenness.value', 'Fifths', '8s'),
-    ]
-    
-    # Print column headers
-    header = ""
-    for path, label, width in detailed_metrics:
-        header += f"{label:{width}} "
-    print(header)
-    print("-" * len(header))
-    
-    # Print data rows
-    for r in results:
-        row = ""
-        for path, label, width in detailed_metrics:
-            value = r.get(path, 'N/A')
-            if isinstance(value, float):
-                value = f"{value:.2f}"
-            elif value is None:
-                value = 'N/A'
-            value = str(value)[:int(width[:-1])-1]
-            row += f"{value:{width}} "
-        print(row)
+    # Emit the whole table with one write instead of a print per row
+    lines = [_DETAILED_HEADER, _DETAILED_SEP]
+    lines.extend("".join(row[split:]) for row in rows)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def display_json_paths(results: List[Dict]):
@@ -224,40 +308,10 @@ def display_csv(results: List[Dict]):
     print("CSV FORMAT (copy and paste to spreadsheet)")
     print("=" * 80)
     
-    # Select important fields for CSV
-    csv_fields = [
-        'name',
-        'summary.facial_harmony_score',
-        'summary.harmony_level',
-        'symmetry.overall_score',
-        'symmetry.level',
-        'golden_ratio_alignment.overall_harmony',
-        'prominent_features.eyes.eye_spacing',
-        'prominent_features.nose.width',
-        'prominent_features.mouth.width',
-        'proportions.face_shape.overall_shape',
-        'eyes.canthal_tilt_deg_L.value',
-        'eyes.canthal_tilt_deg_R.value',
-        'nose.alar_width_over_inter_eye.value',
-        'structure.face_height_over_width.value',
-    ]
-    
-    # Print header
-    print(",".join(csv_fields))
-    
-    # Print data
-    for r in results:
-        values = []
-        for field in csv_fields:
-            value = r.get(field, '')
-            if isinstance(value, float):
-                value = f"{value:.4f}"
-            elif value is None:
-                value = ''
-            # Escape commas in strings
-            value = str(value).replace(',', ';')
-            values.append(value)
-        print(",".join(values))
+    # Collect header and data lines, then emit them with one write
+    lines = [",".join(CSV_FIELDS)]
+    lines.extend(csv_line(r, CSV_FIELDS) for r in results)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def display_detailed(results: List[Dict]):
@@ -298,6 +352,15 @@ def display_detailed(results: List[Dict]):
         print(f"  Jawline: {r.get('proportions.face_shape.jawline', 'N/A')}")
 
 
+def _percent_array(results: List[Dict], path: str) -> np.ndarray:
+    """Parse the 'NN%' strings stored under path into a float array."""
+    values = (r.get(path, '0%') for r in results)
+    return np.fromiter(
+        (pct_to_float(v) for v in values if isinstance(v, str) and '%' in v),
+        dtype=np.float64
+    )
+
+
 def display_summary(results: List[Dict]):
     """Display a summary of all results."""
     
@@ -308,30 +371,20 @@ def display_summary(results: List[Dict]):
     print(f"\nTotal images analyzed: {len(results)}")
     
     # Calculate averages and distributions
-    harmony_scores = []
-    symmetry_scores = []
+    harmony_scores = _percent_array(results, 'summary.facial_harmony_score')
+    symmetry_scores = _percent_array(results, 'symmetry.overall_score')
     
-    for r in results:
-        # Extract numeric values
-        harmony = r.get('summary.facial_harmony_score', '0%')
-        if isinstance(harmony, str) and '%' in harmony:
-            harmony_scores.append(float(harmony.rstrip('%')))
-        
-        symmetry = r.get('symmetry.overall_score', '0%')
-        if isinstance(symmetry, str) and '%' in symmetry:
-            symmetry_scores.append(float(symmetry.rstrip('%')))
-    
-    if harmony_scores:
+    if harmony_scores.size:
         print(f"\nHarmony Scores:")
-        print(f"  Average: {sum(harmony_scores)/len(harmony_scores):.1f}%")
-        print(f"  Best: {max(harmony_scores):.1f}%")
-        print(f"  Lowest: {min(harmony_scores):.1f}%")
+        print(f"  Average: {harmony_scores.mean():.1f}%")
+        print(f"  Best: {harmony_scores.max():.1f}%")
+        print(f"  Lowest: {harmony_scores.min():.1f}%")
     
-    if symmetry_scores:
+    if symmetry_scores.size:
         print(f"\nSymmetry Scores:")
-        print(f"  Average: {sum(symmetry_scores)/len(symmetry_scores):.1f}%")
-        print(f"  Best: {max(symmetry_scores):.1f}%")
-        print(f"  Lowest: {min(symmetry_scores):.1f}%")
+        print(f"  Average: {symmetry_scores.mean():.1f}%")
+        print(f"  Best: {symmetry_scores.max():.1f}%")
+        print(f"  Lowest: {symmetry_scores.min():.1f}%")
     
     # Rank by harmony
     sorted_results = sorted(results, 
@@ -343,6 +396,15 @@ def display_summary(results: List[Dict]):
         print(f"  {i}. {r['name']}: {r.get('summary.facial_harmony_score', 'N/A')}")
 
 
+DISPATCH = {
+    "table": display_table,
+    "detailed": display_detailed,
+    "json_paths": display_json_paths,
+    "csv": display_csv,
+    "summary": display_summary,
+}
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -374,10 +436,15 @@ def main():
     
     if args.all:
         # Show all formats
-        for fmt in ["table", "summary", "json_paths", "csv"]:
-            process_and_display(args.landmarks_dir, fmt)
+        formats = ["table", "summary", "json_paths", "csv"]
     else:
-        process_and_display(args.landmarks_dir, args.format)
+        formats = [args.format]
+    
+    # Run the pipeline once and reuse the results for every format
+    results = _collect_results(args.landmarks_dir, _paths_for(formats))
+    if results:
+        for fmt in formats:
+            DISPATCH[fmt](results)
     
     print("\n" + "=" * 80)
     print("TIP: Use --format json_paths to see all available field paths")
@@ -0,0 +1,159 @@
+"""
+Helpers shared by the horizon scripts.
+"""
+
+import argparse
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to stdlib json
+    orjson = None
+
+
+def list_by_suffix(directory: Union[str, Path], suffixes: Sequence[str],
+                   ignore_case: bool = False) -> Dict[str, List[Path]]:
+    """List a directory once, grouping its files by the first of suffixes that each name ends with.
+    
+    Every suffix maps to a list of paths in directory order (empty when nothing
+    matched), so a suffix that ends with another one must come first
+    ('.golden.final.json' before '.golden.json'). With ignore_case, names are
+    lowercased before matching, so the suffixes should be lowercase. Dotfiles
+    are included, as Path.glob includes them.
+    """
+    groups = {suffix: [] for suffix in suffixes}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name.lower() if ignore_case else entry.name
+            for suffix in suffixes:
+                if name.endswith(suffix):
+                    if entry.is_file():
+                        groups[suffix].append(Path(entry.path))
+                    break
+    return groups
+
+
+def scan_landmarks_dir(landmarks_dir: Union[str, Path]) -> Tuple[List[Path], List[Path], List[Path]]:
+    """Partition one directory listing into sorted landmark, golden and final files.
+    
+    The golden summary file is left out; a missing directory gives empty lists.
+    """
+    if not os.path.isdir(landmarks_dir):
+        return [], [], []
+    
+    groups = list_by_suffix(landmarks_dir, ('.golden.final.json', '.golden.json', '.landmark'))
+    landmark_files = sorted(groups['.landmark'])
+    # Exclude summary file
+    golden_files = sorted(path for path in groups['.golden.json'] if 'summary' not in path.name)
+    final_files = sorted(groups['.golden.final.json'])
+    return landmark_files, golden_files, final_files
+
+
+def positive_int(text: str) -> int:
+    """argparse type for --jobs and other counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return value
+
+
+def worker_count(jobs: Optional[int], default: int, tasks: int) -> int:
+    """Workers to use for tasks independent tasks: jobs when given, else default, never more than tasks.
+    
+    jobs means the same in every script; None picks the script's default and
+    anything below 1 is rejected rather than read as "serial" or "all CPUs".
+    """
+    if jobs is not None and jobs < 1:
+        raise ValueError(f"jobs must be a positive integer, got {jobs}")
+    return max(1, min(jobs or default, tasks))
+
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals that json.dump can emit
+            pass
+    return json.loads(raw)
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Load and parse a JSON file."""
+    return loads_json(Path(path).read_bytes())
+
+
+def dumps_json(obj: Any, compact: bool = False) -> bytes:
+    """Serialize to JSON bytes (2-space indented unless compact), preferring orjson when it is installed.
+    
+    orjson also serializes numpy arrays and scalars; stdlib json does not.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if compact:
+        return json.dumps(obj, separators=(',', ':')).encode()
+    return json.dumps(obj, indent=2).encode()
+
+
+# Compiled table column: (result key, truncation limit, float format, cell formatter)
+TableColumn = Tuple[str, int, str, Callable[[str], str]]
+
+
+def table_column(key: str, width: int, float_fmt: str = '.2f',
+                 limit: Optional[int] = None) -> TableColumn:
+    """Resolve a column's cell formatter once; cells are cut to limit characters (default: width)."""
+    return (key, width if limit is None else limit, float_fmt, f"{{:<{width}}} ".format)
+
+
+def build_header(columns: Iterable[Tuple[str, int]]) -> Tuple[str, str]:
+    """Render (label, width) pairs as a column-label row and its matching separator."""
+    header = "".join(f"{label:<{width}} " for label, width in columns)
+    return header, "-" * len(header)
+
+
+def materialize(results: List[Dict], columns: List[TableColumn]) -> List[List[str]]:
+    """Pre-format the cells of compiled table columns, one list of padded strings per row."""
+    # Format column by column, as a DataFrame renders
+    cells = []
+    for key, limit, float_fmt, fmt in columns:
+        values = [r.get(key) for r in results]
+        cells.append([
+            fmt(('N/A' if v is None else format(v, float_fmt) if isinstance(v, float) else str(v))[:limit])
+            for v in values
+        ])
+    
+    return [list(row) for row in zip(*cells)]
+
+
+# Commas inside CSV values are swapped for semicolons
+_CSV_ESCAPE = str.maketrans(',', ';')
+
+
+def csv_line(result: Dict, fields: Sequence[str]) -> str:
+    """Render result's fields as one CSV line (floats to 4 places, None and missing as empty)."""
+    values = []
+    for field in fields:
+        value = result.get(field, '')
+        if value is None:
+            value = ''
+        elif isinstance(value, float):
+            value = f"{value:.4f}"
+        values.append(str(value).translate(_CSV_ESCAPE))
+    return ",".join(values)
+
+
+@lru_cache(maxsize=256)
+def pct_to_float(value: str) -> float:
+    """Parse an 'NN%' string; scores repeat across rows, so results are memoized."""
+    return float(value.rstrip('%'))
@@ -5,102 +5,223 @@ Combines technical metrics from .golden.json with human-friendly .golden.final.j
 """
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Optional, Set, Tuple
 import sys
 
+import numpy as np
 
-def load_all_results(landmarks_dir: str = "landmarks") -> List[Dict]:
-    """Load and combine results from both golden.json and golden.final.json files."""
+from common import (TableColumn, build_header, csv_line, load_json, materialize, pct_to_float,
+                    positive_int, scan_landmarks_dir, table_column, worker_count)
+
+
+# Sentinel distinguishing a missing key from a stored None
+_MISSING = object()
+
+
+def _dig(data: Any, *keys: str, default: Any = None) -> Any:
+    """Walk nested dicts by key, returning default on the first missing step."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key, _MISSING)
+        if data is _MISSING:
+            return default
+    return data
+
+
+def _istr(value: Any) -> Any:
+    """Intern categorical strings so rows share one object per distinct label."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# golden.json metrics: (result field, key path; the metric dict's 'value' is taken)
+GOLDEN_FIELDS = [
+    # Eyes
+    ('canthal_tilt_L', ('eyes', 'canthal_tilt_deg_L')),
+    ('canthal_tilt_R', ('eyes', 'canthal_tilt_deg_R')),
+    ('eye_fissure_L', ('eyes', 'fissure_length_L')),
+    ('eye_fissure_R', ('eyes', 'fissure_length_R')),
+    ('intercanthal_ratio', ('eyes', 'intercanthal_over_eye_width')),
+    
+    # Nose
+    ('alar_width_ratio', ('nose', 'alar_width_over_inter_eye')),
+    ('nasal_length_ratio', ('nose', 'nasal_length_over_face_height')),
+    ('nasal_projection', ('nose', 'tip_projection_3D_over_IPD')),
+    
+    # Structure
+    ('face_height_width', ('structure', 'face_height_over_width')),
+    ('upper_third', ('structure', 'upper_to_middle_third')),
+    ('lower_third', ('structure', 'lower_to_middle_third')),
+    ('mandibular_angle', ('structure', 'mandibular_angle_deg')),
+    
+    # Golden diagnostics
+    ('thirds_evenness', ('golden_diagnostics', 'thirds_evenness')),
+    ('fifths_evenness', ('golden_diagnostics', 'fifths_evenness')),
+    
+    # Symmetry
+    ('symmetry_score_raw', ('symmetry', 'midline_symmetry_score')),
+]
+
+# golden.final.json interpretations: (result field, key path)
+FINAL_FIELDS = [
+    ('harmony_score', ('summary', 'facial_harmony_score')),
+    ('harmony_level', ('summary', 'harmony_level')),
+    ('symmetry_score', ('symmetry', 'overall_score')),
+    ('symmetry_level', ('symmetry', 'level')),
+    ('golden_harmony', ('golden_ratio_alignment', 'overall_harmony')),
+    
+    # Features
+    ('eye_spacing', ('prominent_features', 'eyes', 'eye_spacing')),
+    ('eye_tilt_desc_L', ('prominent_features', 'eyes', 'left_eye_tilt')),
+    ('eye_tilt_desc_R', ('prominent_features', 'eyes', 'right_eye_tilt')),
+    ('nose_width_desc', ('prominent_features', 'nose', 'width')),
+    ('nose_projection_desc', ('prominent_features', 'nose', 'projection')),
+    ('mouth_width_desc', ('prominent_features', 'mouth', 'width')),
+    ('face_shape', ('proportions', 'face_shape', 'overall_shape')),
+    ('jawline', ('proportions', 'face_shape', 'jawline')),
+]
+
+
+def _load_result(golden_file: Path, needed: Optional[Set[str]] = None) -> Dict:
+    """Combine one image's golden.json metrics with its golden.final.json interpretations.
     
-    landmark_path = Path(landmarks_dir)
-    results = []
+    Only fields in needed are extracted; None extracts every field.
+    """
     
-    # Find all golden.json files
-    golden_files = sorted(landmark_path.glob("*.golden.json"))
-    golden_files = [f for f in golden_files if 'summary' not in f.name]
-    
-    for golden_file in golden_files:
-        name = golden_file.stem.replace('.golden', '')
-        final_file = golden_file.parent / f"{name}.golden.final.json"
-        
-        result = {'name': name}
-        
-        # Load technical metrics from golden.json
+    name = golden_file.stem.replace('.golden', '')
+    final_file = golden_file.parent / f"{name}.golden.final.json"
+    
+    result = {'name': name}
+    golden_fields = GOLDEN_FIELDS if needed is None else [f for f in GOLDEN_FIELDS if f[0] in needed]
+    final_fields = FINAL_FIELDS if needed is None else [f for f in FINAL_FIELDS if f[0] in needed]
+    
+    # Load technical metrics from golden.json
+    if golden_fields:
         try:
-            with open(golden_file, 'r') as f:
-                golden_data = json.load(f)
+            golden_data = load_json(golden_file)
             
             # Extract key technical metrics
             if 'error' not in golden_data:
-                # Eyes
-                eyes = golden_data.get('eyes', {})
-                result['canthal_tilt_L'] = eyes.get('canthal_tilt_deg_L', {}).get('value')
-                result['canthal_tilt_R'] = eyes.get('canthal_tilt_deg_R', {}).get('value')
-                result['eye_fissure_L'] = eyes.get('fissure_length_L', {}).get('value')
-                result['eye_fissure_R'] = eyes.get('fissure_length_R', {}).get('value')
-                result['intercanthal_ratio'] = eyes.get('intercanthal_over_eye_width', {}).get('value')
-                
-                # Nose
-                nose = golden_data.get('nose', {})
-                result['alar_width_ratio'] = nose.get('alar_width_over_inter_eye', {}).get('value')
-                result['nasal_length_ratio'] = nose.get('nasal_length_over_face_height', {}).get('value')
-                result['nasal_projection'] = nose.get('tip_projection_3D_over_IPD', {}).get('value')
-                
-                # Structure
-                structure = golden_data.get('structure', {})
-                result['face_height_width'] = structure.get('face_height_over_width', {}).get('value')
-                result['upper_third'] = structure.get('upper_to_middle_third', {}).get('value')
-                result['lower_third'] = structure.get('lower_to_middle_third', {}).get('value')
-                result['mandibular_angle'] = structure.get('mandibular_angle_deg', {}).get('value')
-                
-                # Golden diagnostics
-                golden_diag = golden_data.get('golden_diagnostics', {})
-                result['thirds_evenness'] = golden_diag.get('thirds_evenness', {}).get('value')
-                result['fifths_evenness'] = golden_diag.get('fifths_evenness', {}).get('value')
-                
-                # Symmetry
-                symmetry = golden_data.get('symmetry', {})
-                result['symmetry_score_raw'] = symmetry.get('midline_symmetry_score', {}).get('value')
+                for field, keys in golden_fields:
+                    result[field] = _dig(golden_data, *keys, 'value')
                 
         except Exception as e:
             print(f"Error loading {golden_file}: {e}", file=sys.stderr)
-        
-        # Load human-friendly interpretations from golden.final.json
+    
+    # Load human-friendly interpretations from golden.final.json
+    if final_fields:
         try:
-            with open(final_file, 'r') as f:
-                final_data = json.load(f)
-            
-            # Extract interpretations
-            result['harmony_score'] = final_data.get('summary', {}).get('facial_harmony_score', 'N/A')
-            result['harmony_level'] = final_data.get('summary', {}).get('harmony_level', 'N/A')
-            result['symmetry_score'] = final_data.get('symmetry', {}).get('overall_score', 'N/A')
-            result['symmetry_level'] = final_data.get('symmetry', {}).get('level', 'N/A')
-            result['golden_harmony'] = final_data.get('golden_ratio_alignment', {}).get('overall_harmony', 'N/A')
-            
-            # Features
-            eyes_feat = final_data.get('prominent_features', {}).get('eyes', {})
-            result['eye_spacing'] = eyes_feat.get('eye_spacing', 'N/A')
-            result['eye_tilt_desc_L'] = eyes_feat.get('left_eye_tilt', 'N/A')
-            result['eye_tilt_desc_R'] = eyes_feat.get('right_eye_tilt', 'N/A')
-            
-            nose_feat = final_data.get('prominent_features', {}).get('nose', {})
-            result['nose_width_desc'] = nose_feat.get('width', 'N/A')
-            result['nose_projection_desc'] = nose_feat.get('projection', 'N/A')
-            
-            mouth_feat = final_data.get('prominent_features', {}).get('mouth', {})
-            result['mouth_width_desc'] = mouth_feat.get('width', 'N/A')
+            final_data = load_json(final_file)
             
-            face_shape = final_data.get('proportions', {}).get('face_shape', {})
-            result['face_shape'] = face_shape.get('overall_shape', 'N/A')
-            result['jawline'] = face_shape.get('jawline', 'N/A')
+            # Extract interpretations (labels come from a small fixed vocabulary)
+            for field, keys in final_fields:
+                result[field] = _istr(_dig(final_data, *keys, default='N/A'))
             
         except Exception as e:
             print(f"Error loading {final_file}: {e}", file=sys.stderr)
-        
-        results.append(result)
     
-    return results
+    return result
+
+
+def load_all_results(landmarks_dir: str = "landmarks", jobs: Optional[int] = None,
+                     needed: Optional[Set[str]] = None) -> List[Dict]:
+    """Load and combine golden.json and golden.final.json results, using up to jobs threads (default: one per CPU)."""
+    
+    # Find all golden.json files
+    _, golden_files, _ = scan_landmarks_dir(landmarks_dir)
+    
+    # Each file pair loads independently; map() keeps the sorted order
+    workers = worker_count(jobs, os.cpu_count() or 1, len(golden_files))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(partial(_load_result, needed=needed), golden_files))
+
+
+# Table columns: (result field, column label, width)
+MAIN_COLUMNS = [
+    ('name', 'Image', 12),
+    ('harmony_score', 'Harmony', 8),
+    ('harmony_level', 'Level', 10),
+    ('symmetry_score', 'Symmetry', 9),
+    ('golden_harmony', 'Golden Ratio', 20),
+    ('face_shape', 'Face Shape', 15),
+    ('eye_spacing', 'Eyes', 12),
+    ('nose_width_desc', 'Nose', 8),
+    ('mouth_width_desc', 'Mouth', 8),
+    ('jawline', 'Jawline', 15),
+]
+
+TECHNICAL_COLUMNS = [
+    ('name', 'Image', 12),
+    ('canthal_tilt_L', 'L-Tilt°', 8),
+    ('canthal_tilt_R', 'R-Tilt°', 8),
+    ('alar_width_ratio', 'Nose/Eye', 9),
+    ('face_height_width', 'H/W', 6),
+    ('thirds_evenness', 'Thirds', 7),
+    ('fifths_evenness', 'Fifths', 7),
+    ('mandibular_angle', 'Jaw°', 7),
+    ('nasal_projection', 'NoseProj', 9),
+    ('symmetry_score_raw', 'SymRaw', 7),
+]
+
+PROPORTION_COLUMNS = [
+    ('name', 'Image', 12),
+    ('upper_third', 'Upper/Mid', 10),
+    ('lower_third', 'Lower/Mid', 10),
+    ('thirds_evenness', 'Thirds Even', 11),
+    ('fifths_evenness', 'Fifths Even', 11),
+    ('face_height_width', 'Height/Width', 12),
+    ('intercanthal_ratio', 'Eye Spacing', 11),
+    ('nasal_length_ratio', 'Nose Length', 11),
+]
+
+# Define all fields to export
+CSV_FIELDS = [
+    'name', 'harmony_score', 'harmony_level', 'symmetry_score', 'symmetry_level',
+    'golden_harmony', 'face_shape', 'jawline', 'eye_spacing', 'nose_width_desc',
+    'mouth_width_desc', 'canthal_tilt_L', 'canthal_tilt_R', 'alar_width_ratio',
+    'face_height_width', 'thirds_evenness', 'fifths_evenness', 'mandibular_angle',
+    'upper_third', 'lower_third', 'nasal_projection', 'intercanthal_ratio'
+]
+
+RANKING_FIELDS = ['name', 'harmony_score', 'harmony_level', 'symmetry_score', 'symmetry_level']
+
+# Result fields each display format reads
+FORMAT_FIELDS = {
+    "main": {field for field, _, _ in MAIN_COLUMNS},
+    "technical": {field for field, _, _ in TECHNICAL_COLUMNS},
+    "proportions": {field for field, _, _ in PROPORTION_COLUMNS},
+    "csv": set(CSV_FIELDS),
+    "ranking": set(RANKING_FIELDS),
+}
+FORMAT_FIELDS["all"] = (FORMAT_FIELDS["main"] | FORMAT_FIELDS["technical"]
+                        | FORMAT_FIELDS["proportions"] | FORMAT_FIELDS["ranking"])
+
+def _compile_columns(columns: List[Tuple[str, str, int]], float_fmt: str,
+                     overrides: Optional[Dict[str, str]] = None) -> List[TableColumn]:
+    """Resolve each column's float precision and cell formatter once."""
+    overrides = overrides or {}
+    return [table_column(field, width, overrides.get(field, float_fmt))
+            for field, _, width in columns]
+
+
+_MAIN_SPECS = _compile_columns(MAIN_COLUMNS, '.2f')
+# Angles read better with one decimal, ratios with three
+_TECHNICAL_SPECS = _compile_columns(
+    TECHNICAL_COLUMNS, '.3f',
+    {field: '.1f' for field, _, _ in TECHNICAL_COLUMNS if 'tilt' in field or 'angle' in field}
+)
+_PROPORTION_SPECS = _compile_columns(PROPORTION_COLUMNS, '.3f')
+
+
+# Labels never change, so each header/separator pair is rendered once
+_MAIN_HEADER, _MAIN_SEP = build_header((label, width) for _, label, width in MAIN_COLUMNS)
+_TECH_HEADER, _TECH_SEP = build_header((label, width) for _, label, width in TECHNICAL_COLUMNS)
+_PROP_HEADER, _PROP_SEP = build_header((label, width) for _, label, width in PROPORTION_COLUMNS)
 
 
 def display_main_table(results: List[Dict]):
@@ -110,39 +231,10 @@ def display_main_table(results: List[Dict]):
     print("MAIN SUMMARY TABLE")
     print("=" * 140)
     
-    # Define columns with width
-    columns = [
-        ('name', 'Image', 12),
-        ('harmony_score', 'Harmony', 8),
-        ('harmony_level', 'Level', 10),
-        ('symmetry_score', 'Symmetry', 9),
-        ('golden_harmony', 'Golden Ratio', 20),
-        ('face_shape', 'Face Shape', 15),
-        ('eye_spacing', 'Eyes', 12),
-        ('nose_width_desc', 'Nose', 8),
-        ('mouth_width_desc', 'Mouth', 8),
-        ('jawline', 'Jawline', 15),
-    ]
-    
-    # Print header
-    header = ""
-    for field, label, width in columns:
-        header += f"{label:<{width}} "
-    print(header)
-    print("-" * len(header))
-    
-    # Print rows
-    for r in results:
-        row = ""
-        for field, label, width in columns:
-            value = r.get(field, 'N/A')
-            if value is None:
-                value = 'N/A'
-            elif isinstance(value, float):
-                value = f"{value:.2f}"
-            value = str(value)[:width]
-            row += f"{value:<{width}} "
-        print(row)
+    # Emit the whole table with one write instead of a print per row
+    lines = [_MAIN_HEADER, _MAIN_SEP]
+    lines.extend("".join(row) for row in materialize(results, _MAIN_SPECS))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def display_technical_table(results: List[Dict]):
@@ -152,42 +244,10 @@ def display_technical_table(results: List[Dict]):
     print("TECHNICAL METRICS TABLE")
     print("=" * 140)
     
-    # Define columns
-    columns = [
-        ('name', 'Image', 12),
-        ('canthal_tilt_L', 'L-Tilt°', 8),
-        ('canthal_tilt_R', 'R-Tilt°', 8),
-        ('alar_width_ratio', 'Nose/Eye', 9),
-        ('face_height_width', 'H/W', 6),
-        ('thirds_evenness', 'Thirds', 7),
-        ('fifths_evenness', 'Fifths', 7),
-        ('mandibular_angle', 'Jaw°', 7),
-        ('nasal_projection', 'NoseProj', 9),
-        ('symmetry_score_raw', 'SymRaw', 7),
-    ]
-    
-    # Print header
-    header = ""
-    for field, label, width in columns:
-        header += f"{label:<{width}} "
-    print(header)
-    print("-" * len(header))
-    
-    # Print rows
-    for r in results:
-        row = ""
-        for field, label, width in columns:
-            value = r.get(field, 'N/A')
-            if value is None:
-                value = 'N/A'
-            elif isinstance(value, float):
-                if 'tilt' in field or 'angle' in field:
-                    value = f"{value:.1f}"
-                else:
-                    value = f"{value:.3f}"
-            value = str(value)[:width]
-            row += f"{value:<{width}} "
-        print(row)
+    # Emit the whole table with one write instead of a print per row
+    lines = [_TECH_HEADER, _TECH_SEP]
+    lines.extend("".join(row) for row in materialize(results, _TECHNICAL_SPECS))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def display_proportions_table(results: List[Dict]):
@@ -197,36 +257,10 @@ def display_proportions_table(results: List[Dict]):
     print("FACIAL PROPORTIONS TABLE")
     print("=" * 140)
     
-    columns = [
-        ('name', 'Image', 12),
-        ('upper_third', 'Upper/Mid', 10),
-        ('lower_third', 'Lower/Mid', 10),
-        ('thirds_evenness', 'Thirds Even', 11),
-        ('fifths_evenness', 'Fifths Even', 11),
-        ('face_height_width', 'Height/Width', 12),
-        ('intercanthal_ratio', 'Eye Spacing', 11),
-        ('nasal_length_ratio', 'Nose Length', 11),
-    ]
-    
-    # Print header
-    header = ""
-    for field, label, width in columns:
-        header += f"{label:<{width}} "
-    print(header)
-    print("-" * len(header))
-    
-    # Print rows
-    for r in results:
-        row = ""
-        for field, label, width in columns:
-            value = r.get(field, 'N/A')
-            if value is None:
-                value = 'N/A'
-            elif isinstance(value, float):
-                value = f"{value:.3f}"
-            value = str(value)[:width]
-            row += f"{value:<{width}} "
-        print(row)
+    # Emit the whole table with one write instead of a print per row
+    lines = [_PROP_HEADER, _PROP_SEP]
+    lines.extend("".join(row) for row in materialize(results, _PROPORTION_SPECS))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def display_csv_export(results: List[Dict]):
@@ -236,31 +270,10 @@ def display_csv_export(results: List[Dict]):
     print("CSV EXPORT (copy to spreadsheet)")
     print("=" * 140)
     
-    # Define all fields to export
-    fields = [
-        'name', 'harmony_score', 'harmony_level', 'symmetry_score', 'symmetry_level',
-        'golden_harmony', 'face_shape', 'jawline', 'eye_spacing', 'nose_width_desc',
-        'mouth_width_desc', 'canthal_tilt_L', 'canthal_tilt_R', 'alar_width_ratio',
-        'face_height_width', 'thirds_evenness', 'fifths_evenness', 'mandibular_angle',
-        'upper_third', 'lower_third', 'nasal_projection', 'intercanthal_ratio'
-    ]
-    
-    # Print header
-    print(",".join(fields))
-    
-    # Print data
-    for r in results:
-        values = []
-        for field in fields:
-            value = r.get(field, '')
-            if value is None:
-                value = ''
-            elif isinstance(value, float):
-                value = f"{value:.4f}"
-            # Escape commas
-            value = str(value).replace(',', ';')
-            values.append(value)
-        print(",".join(values))
+    # Collect header and data lines, then emit them with one write
+    lines = [",".join(CSV_FIELDS)]
+    lines.extend(csv_line(r, CSV_FIELDS) for r in results)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def display_ranking(results: List[Dict]):
@@ -274,17 +287,23 @@ def display_ranking(results: List[Dict]):
     def get_score(r, field):
         val = r.get(field, '0%')
         if isinstance(val, str) and '%' in val:
-            return float(val.rstrip('%'))
+            return pct_to_float(val)
         return 0
     
+    # Parse each score once, then sort on the precomputed keys
+    def rank_by(field):
+        keyed = [(get_score(r, field), r) for r in results]
+        keyed.sort(key=itemgetter(0), reverse=True)
+        return [r for _, r in keyed]
+    
     # Harmony ranking
-    harmony_sorted = sorted(results, key=lambda x: get_score(x, 'harmony_score'), reverse=True)
+    harmony_sorted = rank_by('harmony_score')
     print("\nTop 5 by Harmony Score:")
     for i, r in enumerate(harmony_sorted[:5], 1):
         print(f"  {i}. {r['name']:<15} {r.get('harmony_score', 'N/A'):<8} ({r.get('harmony_level', 'N/A')})")
     
     # Symmetry ranking
-    symmetry_sorted = sorted(results, key=lambda x: get_score(x, 'symmetry_score'), reverse=True)
+    symmetry_sorted = rank_by('symmetry_score')
     print("\nTop 5 by Symmetry Score:")
     for i, r in enumerate(symmetry_sorted[:5], 1):
         print(f"  {i}. {r['name']:<15} {r.get('symmetry_score', 'N/A'):<8} ({r.get('symmetry_level', 'N/A')})")
@@ -293,16 +312,23 @@ def display_ranking(results: List[Dict]):
     print("\n" + "-" * 40)
     print("STATISTICS:")
     
-    harmony_scores = [get_score(r, 'harmony_score') for r in results if r.get('harmony_score') != 'N/A']
-    symmetry_scores = [get_score(r, 'symmetry_score') for r in results if r.get('symmetry_score') != 'N/A']
+    # Parse each score once into an array so mean/max/min run in NumPy
+    harmony_scores = np.fromiter(
+        (get_score(r, 'harmony_score') for r in results if r.get('harmony_score') != 'N/A'),
+        dtype=np.float64
+    )
+    symmetry_scores = np.fromiter(
+        (get_score(r, 'symmetry_score') for r in results if r.get('symmetry_score') != 'N/A'),
+        dtype=np.float64
+    )
     
-    if harmony_scores:
-        print(f"  Harmony - Avg: {sum(harmony_scores)/len(harmony_scores):.1f}%, "
-              f"Max: {max(harmony_scores):.1f}%, Min: {min(harmony_scores):.1f}%")
+    if harmony_scores.size:
+        print(f"  Harmony - Avg: {harmony_scores.mean():.1f}%, "
+              f"Max: {harmony_scores.max():.1f}%, Min: {harmony_scores.min():.1f}%")
     
-    if symmetry_scores:
-        print(f"  Symmetry - Avg: {sum(symmetry_scores)/len(symmetry_scores):.1f}%, "
-              f"Max: {max(symmetry_scores):.1f}%, Min: {min(symmetry_scores):.1f}%")
+    if symmetry_scores.size:
+        print(f"  Symmetry - Avg: {symmetry_scores.mean():.1f}%, "
+              f"Max: {symmetry_scores.max():.1f}%, Min: {symmetry_scores.min():.1f}%")
 
 
 def main():
@@ -325,11 +351,18 @@ def main():
         default="all",
         help="Display format (default: all)"
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        default=None,
+        help="Number of threads used to load result files (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
-    # Load all results
-    results = load_all_results(args.landmarks_dir)
+    # Load all results (only the fields the chosen format shows)
+    results = load_all_results(args.landmarks_dir, args.jobs, FORMAT_FIELDS[args.format])
     
     if not results:
         print("No results found!")
@@ -7,8 +7,10 @@ Detects faces in images from input directory and saves cropped faces to output d
 import os
 import sys
 import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 import math
 import cv2
 import numpy as np
@@ -16,16 +18,34 @@ import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+from image_utils import (JPEG_QUALITY, MAX_ASPECT_RATIO, MIN_SHORT_EDGE, detections_to_array,
+                         encode_params, find_images, is_croppable_size, prefetch_images,
+                         read_detection_image, rescale_detections, to_detection_image)
+
+
 # Constants for visualization
 MARGIN = 10  # pixels
 ROW_SIZE = 10  # pixels
 FONT_SIZE = 1
 FONT_THICKNESS = 1
 TEXT_COLOR = (255, 0, 0)  # red
+TEXT_COLOR_BGR = TEXT_COLOR[::-1]  # red, for drawing straight onto OpenCV images
 
 # Face detection parameters
 DETECTION_CONFIDENCE = 0.5
 CROP_PADDING = 20  # pixels to add around face bounding box
+DECODE_THREADS = 2  # images decoded ahead of detection
+WRITE_THREADS = 2  # crops encoded and written behind detection
+
+# Per-image progress goes to INFO, shown only with --verbose
+logger = logging.getLogger(__name__)
+
+
+def _is_valid_normalized_value(value: float) -> bool:
+    """Checks if the float value is between 0 and 1."""
+    # isclose(0, v) with the default tolerances only holds for v == 0, so the
+    # lower bound is a plain comparison; the upper bound keeps its tolerance
+    return 0.0 <= value <= 1.0 or math.isclose(1, value)
 
 
 def _normalized_to_pixel_coordinates(
@@ -33,13 +53,8 @@ def _normalized_to_pixel_coordinates(
     image_height: int) -> Union[None, Tuple[int, int]]:
     """Converts normalized value pair to pixel coordinates."""
 
-    # Checks if the float value is between 0 and 1.
-    def is_valid_normalized_value(value: float) -> bool:
-        return (value > 0 or math.isclose(0, value)) and (value < 1 or
-                                                          math.isclose(1, value))
-
-    if not (is_valid_normalized_value(normalized_x) and
-            is_valid_normalized_value(normalized_y)):
+    if not (_is_valid_normalized_value(normalized_x) and
+            _is_valid_normalized_value(normalized_y)):
         # TODO: Draw coordinates even if it's outside of the image bounds.
         return None
     x_px = min(math.floor(normalized_x * image_width), image_width - 1)
@@ -49,24 +64,29 @@ def _normalized_to_pixel_coordinates(
 
 def visualize(
     image,
-    detection_result
+    detection_result,
+    bgr: bool = False,
+    inplace: bool = False
 ) -> np.ndarray:
     """Draws bounding boxes and keypoints on the input image and return it.
     Args:
-        image: The input RGB image.
+        image: The input RGB image (BGR when bgr is True).
         detection_result: The list of all "Detection" entities to be visualize.
+        bgr: Draw in BGR colors, so OpenCV images need no conversion round-trip.
+        inplace: Draw on image itself instead of a copy.
     Returns:
         Image with bounding boxes.
     """
-    annotated_image = image.copy()
+    annotated_image = image if inplace else image.copy()
     height, width, _ = image.shape
+    text_color = TEXT_COLOR_BGR if bgr else TEXT_COLOR
 
     for detection in detection_result.detections:
         # Draw bounding_box
         bbox = detection.bounding_box
         start_point = bbox.origin_x, bbox.origin_y
         end_point = bbox.origin_x + bbox.width, bbox.origin_y + bbox.height
-        cv2.rectangle(annotated_image, start_point, end_point, TEXT_COLOR, 3)
+        cv2.rectangle(annotated_image, start_point, end_point, text_color, 3)
 
         # Draw keypoints
         for keypoint in detection.keypoints:
@@ -84,7 +104,7 @@ def visualize(
         text_location = (MARGIN + bbox.origin_x,
                          MARGIN + ROW_SIZE + bbox.origin_y)
         cv2.putText(annotated_image, result_text, text_location, cv2.FONT_HERSHEY_PLAIN,
-                    FONT_SIZE, TEXT_COLOR, FONT_THICKNESS)
+                    FONT_SIZE, text_color, FONT_THICKNESS)
 
     return annotated_image
 
@@ -108,13 +128,31 @@ def crop_face(image: np.ndarray, bbox, padding: int = CROP_PADDING) -> np.ndarra
     x2 = min(width, bbox.origin_x + bbox.width + padding)
     y2 = min(height, bbox.origin_y + bbox.height + padding)
     
-    # Crop the face
-    cropped = image[y1:y2, x1:x2]
+    # Crop the face into its own buffer, ready for the encoder. Always a copy:
+    # a full-width crop is already contiguous and ascontiguousarray would return a view
+    cropped = image[y1:y2, x1:x2].copy()
     
     return cropped
 
 
-def process_image(detector, image_path: Path, output_dir: Path, visualize_results: bool = False, padding: int = CROP_PADDING):
+def crop_face_batch(image: np.ndarray, det_arr: np.ndarray, padding: int = CROP_PADDING) -> List[np.ndarray]:
+    """Crop every detected face at once from a detections_to_array result."""
+    height, width = image.shape[:2]
+    boxes = det_arr[:, :4].astype(np.int64)
+    
+    # Same bounds as crop_face, computed for every face in one vectorized pass
+    x1 = np.maximum(0, boxes[:, 0] - padding)
+    y1 = np.maximum(0, boxes[:, 1] - padding)
+    x2 = np.minimum(width, boxes[:, 0] + boxes[:, 2] + padding)
+    y2 = np.minimum(height, boxes[:, 1] + boxes[:, 3] + padding)
+    
+    # Copies, not views (see crop_face): process_image draws on the frame afterwards
+    return [image[top:bottom, left:right].copy()
+            for left, top, right, bottom in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())]
+
+
+def process_image(detector, image_path: Path, output_dir: Path, visualize_results: bool = False, padding: int = CROP_PADDING,
+                  detection_np: Optional[np.ndarray] = None, write: Callable[[str, np.ndarray], Any] = cv2.imwrite):
     """Process a single image: detect faces and save cropped faces.
     
     Args:
@@ -122,66 +160,73 @@ def process_image(detector, image_path: Path, output_dir: Path, visualize_result
         image_path: Path to input image
         output_dir: Directory to save cropped faces
         visualize_results: Whether to save visualized detection results
+        detection_np: Reduced-scale BGR decode for detection; read from image_path when None
+        write: Function used to save images (cv2.imwrite signature)
     """
-    # Read image
-    image = mp.Image.create_from_file(str(image_path))
-    
-    # Convert to numpy array for OpenCV operations
-    image_np = cv2.imread(str(image_path))
-    if image_np is None:
-        print(f"Error reading image: {image_path}")
+    # Detection only needs a reduced decode (libjpeg scales during the IDCT)
+    if detection_np is None:
+        detection_np = read_detection_image(image_path)
+    if detection_np is None:
+        logger.error("Error reading image: %s", image_path)
         return
     
+    image, _ = to_detection_image(detection_np)
+    
     # Detect faces
     detection_result = detector.detect(image)
     
     if not detection_result.detections:
-        print(f"No faces detected in {image_path.name}")
+        logger.info("No faces detected in %s", image_path.name)
         return
     
-    print(f"Found {len(detection_result.detections)} face(s) in {image_path.name}")
+    # Full-resolution pixels are decoded only once a face is known to be there
+    image_np = cv2.imread(str(image_path))
+    if image_np is None:
+        logger.error("Error reading image: %s", image_path)
+        return
+    
+    # Map boxes from the detection image back to full resolution
+    rescale_detections(detection_result, image.width / image_np.shape[1])
+    
+    logger.info("Found %d face(s) in %s", len(detection_result.detections), image_path.name)
+    
+    # Crop every face first, so the visualization can draw on the frame itself
+    det_arr = detections_to_array(detection_result.detections)
+    crops = crop_face_batch(image_np, det_arr, padding)
     
     # Save visualization if requested (in a separate visualizations directory)
     if visualize_results:
         vis_dir = output_dir / "visualizations"
         vis_dir.mkdir(parents=True, exist_ok=True)
-        # Convert BGR to RGB for visualization
-        image_rgb = cv2.cvtColor(image_np, cv2.COLOR_BGR2RGB)
-        annotated = visualize(image_rgb, detection_result)
-        # Convert back to BGR for saving
-        annotated_bgr = cv2.cvtColor(annotated, cv2.COLOR_RGB2BGR)
+        # Draw in BGR directly; imwrite expects BGR anyway
+        annotated_bgr = visualize(image_np, detection_result, bgr=True, inplace=True)
         vis_path = vis_dir / f"{image_path.stem}_detected.jpg"
-        cv2.imwrite(str(vis_path), annotated_bgr)
-        print(f"  Saved visualization to {vis_path}")
+        write(str(vis_path), annotated_bgr)
+        logger.info("  Saved visualization to %s", vis_path)
     
     # Crop and save the first detected face with the same name as the original
     if detection_result.detections:
         # Take the first face (highest confidence)
-        detection = detection_result.detections[0]
-        bbox = detection.bounding_box
-        cropped_face = crop_face(image_np, bbox, padding)
+        cropped_face = crops[0]
         
         # Save cropped face with same name as original
         crop_path = output_dir / image_path.name
-        cv2.imwrite(str(crop_path), cropped_face)
+        write(str(crop_path), cropped_face)
         
         # Get confidence score
-        confidence = detection.categories[0].score if detection.categories else 0.0
-        print(f"  Saved cropped face (confidence: {confidence:.2f}) to {crop_path}")
+        confidence = det_arr[0, 4]
+        logger.info("  Saved cropped face (confidence: %.2f) to %s", confidence, crop_path)
         
         # If there are multiple faces, save the additional ones with a suffix
-        if len(detection_result.detections) > 1:
-            for i, detection in enumerate(detection_result.detections[1:], 1):
-                bbox = detection.bounding_box
-                cropped_face = crop_face(image_np, bbox, padding)
-                
+        if len(crops) > 1:
+            for i, cropped_face in enumerate(crops[1:], 1):
                 # Save additional faces with suffix
                 crop_filename = f"{image_path.stem}_face_{i}.jpg"
                 crop_path = output_dir / crop_filename
-                cv2.imwrite(str(crop_path), cropped_face)
+                write(str(crop_path), cropped_face)
                 
-                confidence = detection.categories[0].score if detection.categories else 0.0
-                print(f"  Saved additional face {i} (confidence: {confidence:.2f}) to {crop_path}")
+                confidence = det_arr[i, 4]
+                logger.info("  Saved additional face %d (confidence: %.2f) to %s", i, confidence, crop_path)
 
 
 def main():
@@ -198,12 +243,19 @@ def main():
                         help=f'Padding pixels around face crops (default: {CROP_PADDING})')
     parser.add_argument('--visualize', action='store_true',
                         help='Save visualization images with bounding boxes')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Log progress for every image, not just the totals')
+    parser.add_argument('--jpeg-quality', type=int, default=JPEG_QUALITY,
+                        help=f'JPEG quality for saved images (default: {JPEG_QUALITY})')
     parser.add_argument('--extensions', nargs='+', 
                         default=['jpg', 'jpeg', 'png', 'bmp'],
                         help='Image file extensions to process')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(message)s', stream=sys.stdout)
+    
     # Validate input directory
     input_dir = Path(args.input_dir)
     if not input_dir.exists():
@@ -235,25 +287,49 @@ def main():
     detector = vision.FaceDetector.create_from_options(options)
     
     # Find all image files
-    image_files = []
-    for ext in args.extensions:
-        image_files.extend(input_dir.glob(f'*.{ext}'))
-        image_files.extend(input_dir.glob(f'*.{ext.upper()}'))
+    image_files = find_images(input_dir, args.extensions)
     
     if not image_files:
         print(f"No image files found in {input_dir} with extensions: {args.extensions}")
         sys.exit(1)
     
     print(f"Found {len(image_files)} image(s) to process")
+    
+    # Drop images whose header already rules out a face crop, before any decoding
+    candidates = [path for path in sorted(image_files) if is_croppable_size(path)]
+    if len(candidates) < len(image_files):
+        print(f"Skipping {len(image_files) - len(candidates)} image(s) smaller than "
+              f"{MIN_SHORT_EDGE}px or more elongated than {MAX_ASPECT_RATIO:g}:1")
     print("-" * 50)
     
-    # Process each image
-    for image_path in sorted(image_files):
+    # Process each image: decoding runs ahead and writing runs behind the
+    # detector, which stays on this thread (MediaPipe tasks are not thread-safe)
+    pending_writes = []
+    with ThreadPoolExecutor(max_workers=DECODE_THREADS) as decode_pool, \
+            ThreadPoolExecutor(max_workers=WRITE_THREADS) as write_pool:
+        
+        def write_async(path: str, image: np.ndarray):
+            # A view into a larger frame gets its own copy, so the frame is not
+            # pinned (or changed) while the write is queued; crops are copies already
+            if image.base is not None:
+                image = image.copy()
+            params = encode_params(path, args.jpeg_quality)
+            pending_writes.append((path, write_pool.submit(cv2.imwrite, path, image, params)))
+        
+        for image_path, decoded in prefetch_images(candidates, decode_pool, read_detection_image):
+            try:
+                process_image(detector, image_path, output_dir, args.visualize, args.padding,
+                              detection_np=decoded.result(), write=write_async)
+            except Exception as e:
+                logger.error("Error processing %s: %s", image_path, e)
+                continue
+    
+    # Report writes that failed in the background
+    for path, future in pending_writes:
         try:
-            process_image(detector, image_path, output_dir, args.visualize, args.padding)
+            future.result()
         except Exception as e:
-            print(f"Error processing {image_path}: {e}")
-            continue
+            logger.error("Error writing %s: %s", path, e)
     
     print("-" * 50)
     print(f"Processing complete. Results saved to {output_dir}")
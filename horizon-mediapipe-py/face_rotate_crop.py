@@ -7,8 +7,13 @@ Detects faces, corrects rotation based on face landmarks, and saves cropped face
 import os
 import sys
 import argparse
+import logging
+import hashlib
+import sqlite3
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 import math
 import cv2
 import numpy as np
@@ -16,16 +21,40 @@ import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+from mediapipe.tasks.python.components.containers import BoundingBox, NormalizedLandmark
+
+from image_utils import (JPEG_QUALITY, MAX_ASPECT_RATIO, MIN_SHORT_EDGE, detections_to_array,
+                         encode_params, find_images, is_croppable_size, prefetch_images,
+                         read_detection_image, rescale_detections, to_detection_image, to_mp_image)
+
 # Constants for visualization
 MARGIN = 10  # pixels
 ROW_SIZE = 10  # pixels
 FONT_SIZE = 1
 FONT_THICKNESS = 1
 TEXT_COLOR = (255, 0, 0)  # red
+TEXT_COLOR_BGR = TEXT_COLOR[::-1]  # red, for drawing straight onto OpenCV images
 
 # Face detection parameters
 DETECTION_CONFIDENCE = 0.5
 CROP_PADDING = 20  # pixels to add around face bounding box
+DECODE_THREADS = 2  # images decoded ahead of detection
+WRITE_THREADS = 2  # crops encoded and written behind detection
+CACHE_FILENAME = '.cache.db'  # detection cache kept in the output directory
+CACHE_COMMIT_EVERY = 100  # inserts per commit, to amortize fsync
+CACHE_VERSION = 2  # bump when detection, gating or tiling changes what a run would cache
+LANDMARK_TILE_SIZE = 256  # longest side of the face tile given to the landmarker
+ROTATION_GATE = 3.0  # degrees of keypoint roll before the landmarker is consulted
+
+# Per-image progress goes to INFO, shown only with --verbose
+logger = logging.getLogger(__name__)
+
+
+def _is_valid_normalized_value(value: float) -> bool:
+    """Checks if the float value is between 0 and 1."""
+    # isclose(0, v) with the default tolerances only holds for v == 0, so the
+    # lower bound is a plain comparison; the upper bound keeps its tolerance
+    return 0.0 <= value <= 1.0 or math.isclose(1, value)
 
 
 def _normalized_to_pixel_coordinates(
@@ -33,13 +62,8 @@ def _normalized_to_pixel_coordinates(
     image_height: int) -> Union[None, Tuple[int, int]]:
     """Converts normalized value pair to pixel coordinates."""
 
-    # Checks if the float value is between 0 and 1.
-    def is_valid_normalized_value(value: float) -> bool:
-        return (value > 0 or math.isclose(0, value)) and (value < 1 or
-                                                          math.isclose(1, value))
-
-    if not (is_valid_normalized_value(normalized_x) and
-            is_valid_normalized_value(normalized_y)):
+    if not (_is_valid_normalized_value(normalized_x) and
+            _is_valid_normalized_value(normalized_y)):
         return None
     x_px = min(math.floor(normalized_x * image_width), image_width - 1)
     y_px = min(math.floor(normalized_y * image_height), image_height - 1)
@@ -60,11 +84,11 @@ def calculate_face_rotation(landmarks, image_width: int, image_height: int, verb
     """
     if not landmarks or len(landmarks) < 468:
         if verbose:
-            print("    ❌ Insufficient landmarks for rotation calculation")
+            logger.info("    ❌ Insufficient landmarks for rotation calculation")
         return 0.0
     
     if verbose:
-        print("    🔍 Analyzing T-axis landmarks:")
+        logger.info("    🔍 Analyzing T-axis landmarks:")
     
     # Key landmark indices for T-axis analysis
     left_eye_center = landmarks[159]   # Left eye center
@@ -74,36 +98,37 @@ def calculate_face_rotation(landmarks, image_width: int, image_height: int, verb
     mouth_center = landmarks[13]      # Upper lip center
     chin = landmarks[175]             # Chin center
     
-    # Convert normalized coordinates to pixels
+    # Convert normalized coordinates to pixels (only the eyes feed the angle)
     left_eye_px = _normalized_to_pixel_coordinates(
         left_eye_center.x, left_eye_center.y, image_width, image_height)
     right_eye_px = _normalized_to_pixel_coordinates(
         right_eye_center.x, right_eye_center.y, image_width, image_height)
-    nose_tip_px = _normalized_to_pixel_coordinates(
-        nose_tip.x, nose_tip.y, image_width, image_height)
-    nose_bottom_px = _normalized_to_pixel_coordinates(
-        nose_bottom.x, nose_bottom.y, image_width, image_height)
-    mouth_px = _normalized_to_pixel_coordinates(
-        mouth_center.x, mouth_center.y, image_width, image_height)
-    chin_px = _normalized_to_pixel_coordinates(
-        chin.x, chin.y, image_width, image_height)
     
     if not left_eye_px or not right_eye_px:
         if verbose:
-            print("    ❌ Could not convert eye coordinates to pixels")
+            logger.info("    ❌ Could not convert eye coordinates to pixels")
         return 0.0
     
     if verbose:
-        print(f"    👁️  Left Eye Center:  ({left_eye_px[0]:4.0f}, {left_eye_px[1]:4.0f})")
-        print(f"    👁️  Right Eye Center: ({right_eye_px[0]:4.0f}, {right_eye_px[1]:4.0f})")
+        nose_tip_px = _normalized_to_pixel_coordinates(
+            nose_tip.x, nose_tip.y, image_width, image_height)
+        nose_bottom_px = _normalized_to_pixel_coordinates(
+            nose_bottom.x, nose_bottom.y, image_width, image_height)
+        mouth_px = _normalized_to_pixel_coordinates(
+            mouth_center.x, mouth_center.y, image_width, image_height)
+        chin_px = _normalized_to_pixel_coordinates(
+            chin.x, chin.y, image_width, image_height)
+        
+        logger.info("    👁️  Left Eye Center:  (%4.0f, %4.0f)", left_eye_px[0], left_eye_px[1])
+        logger.info("    👁️  Right Eye Center: (%4.0f, %4.0f)", right_eye_px[0], right_eye_px[1])
         if nose_tip_px:
-            print(f"    👃 Nose Tip:         ({nose_tip_px[0]:4.0f}, {nose_tip_px[1]:4.0f})")
+            logger.info("    👃 Nose Tip:         (%4.0f, %4.0f)", nose_tip_px[0], nose_tip_px[1])
         if nose_bottom_px:
-            print(f"    👃 Nose Bottom:      ({nose_bottom_px[0]:4.0f}, {nose_bottom_px[1]:4.0f})")
+            logger.info("    👃 Nose Bottom:      (%4.0f, %4.0f)", nose_bottom_px[0], nose_bottom_px[1])
         if mouth_px:
-            print(f"    👄 Mouth Center:     ({mouth_px[0]:4.0f}, {mouth_px[1]:4.0f})")
+            logger.info("    👄 Mouth Center:     (%4.0f, %4.0f)", mouth_px[0], mouth_px[1])
         if chin_px:
-            print(f"    🦲 Chin:             ({chin_px[0]:4.0f}, {chin_px[1]:4.0f})")
+            logger.info("    🦲 Chin:             (%4.0f, %4.0f)", chin_px[0], chin_px[1])
     
     # Calculate horizontal line between eyes
     dx = right_eye_px[0] - left_eye_px[0]
@@ -114,72 +139,58 @@ def calculate_face_rotation(landmarks, image_width: int, image_height: int, verb
     angle = math.degrees(math.atan2(dy, dx))
     
     if verbose:
-        print(f"    📏 Eye separation: dx={dx:6.1f}px, dy={dy:6.1f}px, distance={eye_distance:.1f}px")
-        print(f"    📐 Current T-axis rotation: {angle:+6.1f}° from horizontal")
-        print(f"    🔄 Correction needed: {angle:+6.1f}° (same angle) to align eyes horizontally")
+        logger.info("    📏 Eye separation: dx=%6.1fpx, dy=%6.1fpx, distance=%.1fpx", dx, dy, eye_distance)
+        logger.info("    📐 Current T-axis rotation: %+6.1f° from horizontal", angle)
+        logger.info("    🔄 Correction needed: %+6.1f° (same angle) to align eyes horizontally", angle)
         
         # Calculate vertical alignment check
         if nose_tip_px and mouth_px:
             nose_mouth_dx = mouth_px[0] - nose_tip_px[0]
             nose_mouth_dy = mouth_px[1] - nose_tip_px[1]
             vertical_angle = math.degrees(math.atan2(nose_mouth_dx, nose_mouth_dy))
-            print(f"    📏 Nose-Mouth vertical alignment: {vertical_angle:+6.1f}° from vertical")
+            logger.info("    📏 Nose-Mouth vertical alignment: %+6.1f° from vertical", vertical_angle)
     
     return angle
 
 
-def rotate_image(image: np.ndarray, angle: float) -> np.ndarray:
-    """Rotate image by given angle while keeping all content visible.
-    
-    Args:
-        image: Input image
-        angle: Rotation angle in degrees (positive = clockwise)
+def estimate_keypoint_roll(detection, image_width: int, image_height: int) -> Optional[float]:
+    """Estimate face roll from the detector's two eye keypoints.
     
     Returns:
-        Rotated image
+        Angle in degrees (same convention as calculate_face_rotation), or None
+        when the detection carries no eye keypoints
     """
-    if abs(angle) < 1.0:  # Skip rotation for very small angles
-        return image
-    
-    height, width = image.shape[:2]
-    center = (width // 2, height // 2)
-    
-    # Get rotation matrix (OpenCV rotates counterclockwise for positive angles)
-    rotation_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
-    
-    # Calculate new image dimensions to fit the rotated image
-    cos_angle = abs(rotation_matrix[0, 0])
-    sin_angle = abs(rotation_matrix[0, 1])
-    
-    new_width = int((height * sin_angle) + (width * cos_angle))
-    new_height = int((height * cos_angle) + (width * sin_angle))
-    
-    # Adjust translation to center the image
-    rotation_matrix[0, 2] += (new_width / 2) - center[0]
-    rotation_matrix[1, 2] += (new_height / 2) - center[1]
-    
-    # Perform rotation
-    rotated = cv2.warpAffine(image, rotation_matrix, (new_width, new_height),
-                            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT,
-                            borderValue=(0, 0, 0))
+    keypoints = detection.keypoints
+    if not keypoints or len(keypoints) < 2:
+        return None
     
-    return rotated
+    # BlazeFace keypoints 0 and 1 are the eyes, ordered left to right in the image
+    dx = (keypoints[1].x - keypoints[0].x) * image_width
+    dy = (keypoints[1].y - keypoints[0].y) * image_height
+    return math.degrees(math.atan2(dy, dx))
 
 
 def visualize(
     image,
-    detection_result
+    detection_result,
+    bgr: bool = False,
+    inplace: bool = False
 ) -> np.ndarray:
-    """Draws bounding boxes and keypoints on the input image and return it."""
-    annotated_image = image.copy()
+    """Draws bounding boxes and keypoints on the input image and return it.
+    
+    Pass bgr=True to draw on an OpenCV BGR image without converting it to RGB,
+    and inplace=True to draw on image itself instead of a copy.
+    """
+    annotated_image = image if inplace else image.copy()
     height, width, _ = image.shape
+    text_color = TEXT_COLOR_BGR if bgr else TEXT_COLOR
 
     for detection in detection_result.detections:
         # Draw bounding_box
         bbox = detection.bounding_box
         start_point = bbox.origin_x, bbox.origin_y
         end_point = bbox.origin_x + bbox.width, bbox.origin_y + bbox.height
-        cv2.rectangle(annotated_image, start_point, end_point, TEXT_COLOR, 3)
+        cv2.rectangle(annotated_image, start_point, end_point, text_color, 3)
 
         # Draw keypoints
         for keypoint in detection.keypoints:
@@ -198,15 +209,13 @@ def visualize(
         text_location = (MARGIN + bbox.origin_x,
                          MARGIN + ROW_SIZE + bbox.origin_y)
         cv2.putText(annotated_image, result_text, text_location, cv2.FONT_HERSHEY_PLAIN,
-                    FONT_SIZE, TEXT_COLOR, FONT_THICKNESS)
+                    FONT_SIZE, text_color, FONT_THICKNESS)
 
     return annotated_image
 
 
-def crop_face(image: np.ndarray, bbox, target_size: int = 500) -> np.ndarray:
-    """Crop face with 2x enlarged rectangle and resize to target_size x target_size."""
-    height, width = image.shape[:2]
-    
+def _crop_window(bbox, width: int, height: int) -> Tuple[int, int, int, int]:
+    """The 2x enlarged square around a face, clipped to the image: (x1, y1, x2, y2)."""
     # Get face rectangle dimensions
     face_width = bbox.width
     face_height = bbox.height
@@ -236,6 +245,13 @@ def crop_face(image: np.ndarray, bbox, target_size: int = 500) -> np.ndarray:
     y2 = min(y2, height)
     x1 = max(0, x2 - crop_dimension)
     y1 = max(0, y2 - crop_dimension)
+    return x1, y1, x2, y2
+
+
+def crop_face(image: np.ndarray, bbox, target_size: int = 500) -> np.ndarray:
+    """Crop face with 2x enlarged rectangle and resize to target_size x target_size."""
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = _crop_window(bbox, width, height)
     
     # Crop the enlarged face area
     cropped = image[y1:y2, x1:x2]
@@ -247,93 +263,267 @@ def crop_face(image: np.ndarray, bbox, target_size: int = 500) -> np.ndarray:
     return cropped
 
 
+def detect_tile_landmarks(face_landmarker, image: np.ndarray, bbox,
+                          tile_size: int = LANDMARK_TILE_SIZE) -> Optional[List[NormalizedLandmark]]:
+    """Run the landmarker on a small tile around a detected face.
+    
+    The tile is the 2x enlarged face square, downscaled to at most tile_size.
+    Landmarks are returned normalized to the full image, so they can be used
+    exactly like landmarks detected on the whole frame.
+    """
+    height, width = image.shape[:2]
+    
+    # Square tile of twice the face size, clipped to the image
+    half = max(bbox.width, bbox.height)
+    center_x = bbox.origin_x + bbox.width // 2
+    center_y = bbox.origin_y + bbox.height // 2
+    x1, y1 = max(0, center_x - half), max(0, center_y - half)
+    x2, y2 = min(width, center_x + half), min(height, center_y + half)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    
+    tile = image[y1:y2, x1:x2]
+    tile_width, tile_height = x2 - x1, y2 - y1
+    scale = tile_size / max(tile_width, tile_height)
+    if scale < 1.0:
+        tile = cv2.resize(tile, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    
+    result = face_landmarker.detect(to_mp_image(tile))
+    if not result.face_landmarks:
+        return None
+    
+    # Map tile-normalized coordinates back to full-image normalized coordinates
+    return [NormalizedLandmark(x=(x1 + lm.x * tile_width) / width,
+                               y=(y1 + lm.y * tile_height) / height,
+                               z=lm.z)
+            for lm in result.face_landmarks[0]]
+
+
+def crop_rotated_face(image: np.ndarray, bbox, angle: float, target_size: int = 500) -> np.ndarray:
+    """Rotate the face upright, then crop and resize it exactly as crop_face does.
+    
+    Only the crop window is rendered, at full resolution, by a warpAffine that
+    rotates about the face center; the whole image is never rotated.
+    """
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = _crop_window(bbox, width, height)
+    if x2 <= x1 or y2 <= y1:
+        return image[y1:y2, x1:x2]
+    
+    # Rotate about the face center, then move the crop window to the origin
+    face_center = (bbox.origin_x + bbox.width // 2, bbox.origin_y + bbox.height // 2)
+    rotation_matrix = cv2.getRotationMatrix2D(face_center, angle, 1.0)
+    rotation_matrix[0, 2] -= x1
+    rotation_matrix[1, 2] -= y1
+    rotated = cv2.warpAffine(image, rotation_matrix, (x2 - x1, y2 - y1),
+                             flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT,
+                             borderValue=(0, 0, 0))
+    
+    # Resize to target size (500x500)
+    return cv2.resize(rotated, (target_size, target_size), interpolation=cv2.INTER_LANCZOS4)
+
+
+class DetectionCache:
+    """SQLite cache of per-image detection results, so re-runs skip inference.
+    
+    Entries are keyed by file mtime, size and a hash of the first 64KB, plus
+    the detector setup: CACHE_VERSION, the detection confidence and each model
+    file's path and mtime. They hold the best face box, its confidence, the
+    number of faces found and the rotation angle.
+    """
+    
+    _BBOX = struct.Struct('<4i')
+    
+    def __init__(self, db_path: Path, confidence: float, model_paths: Tuple[str, ...]):
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS detections ("
+            "key TEXT PRIMARY KEY, bbox BLOB, confidence REAL, faces INTEGER, angle REAL)"
+        )
+        self.uncommitted = 0
+        
+        # Switching models or settings must miss the cache rather than reuse stale results
+        models = [f"{os.path.abspath(path)}@{os.stat(path).st_mtime_ns}" for path in model_paths]
+        self.setup = ':'.join([f"v{CACHE_VERSION}", repr(confidence), *models])
+    
+    def make_key(self, image_path: Path) -> str:
+        """Build the cache key for an image file under this cache's detector setup."""
+        st = image_path.stat()
+        with open(image_path, 'rb') as f:
+            digest = hashlib.sha1(f.read(65536)).hexdigest()
+        return f"{st.st_mtime_ns}:{st.st_size}:{digest}:{self.setup}"
+    
+    def get(self, key: str) -> Optional[Tuple[Optional[BoundingBox], float, int, float]]:
+        """Return (bbox, confidence, faces, angle) for a cached image, or None."""
+        row = self.conn.execute(
+            "SELECT bbox, confidence, faces, angle FROM detections WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        bbox_blob, confidence, faces, angle = row
+        bbox = BoundingBox(*self._BBOX.unpack(bbox_blob)) if bbox_blob else None
+        return bbox, confidence, faces, angle
+    
+    def put(self, key: str, bbox: Optional[BoundingBox], confidence: float, faces: int, angle: float):
+        """Store one image's result; faces == 0 records that nothing was found."""
+        bbox_blob = None
+        if bbox is not None:
+            bbox_blob = self._BBOX.pack(bbox.origin_x, bbox.origin_y, bbox.width, bbox.height)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?)",
+            (key, bbox_blob, confidence, faces, angle)
+        )
+        self.uncommitted += 1
+        if self.uncommitted >= CACHE_COMMIT_EVERY:
+            self.conn.commit()
+            self.uncommitted = 0
+    
+    def close(self):
+        """Commit any pending inserts and close the database."""
+        self.conn.commit()
+        self.conn.close()
+
+
+def best_face_crop(image_np: np.ndarray, bbox, rotation_angle: float) -> np.ndarray:
+    """Crop the face as a 500x500 image, rotating it when needed."""
+    if abs(rotation_angle) > 1.0:
+        # Rotate only the crop window around the face
+        return crop_rotated_face(image_np, bbox, rotation_angle)
+    return crop_face(image_np, bbox)
+
+
+def save_best_crop(cropped_face: np.ndarray, rotation_angle: float, crop_path: Path,
+                   write: Callable[[str, np.ndarray], Any] = cv2.imwrite):
+    """Save a best_face_crop result, reporting any rotation it applied."""
+    if abs(rotation_angle) > 1.0:
+        logger.info("  Applied rotation correction: %.1f°", rotation_angle)
+    
+    # Save cropped face with same name as original (500x500)
+    write(str(crop_path), cropped_face)
+
+
 def process_image(face_detector, face_landmarker, image_path: Path, output_dir: Path, 
-                 visualize_results: bool = False, verbose: bool = False):
-    """Process a single image: detect faces, correct rotation, and save cropped faces."""
+                 visualize_results: bool = False, verbose: bool = False,
+                 detection_np: Optional[np.ndarray] = None,
+                 write: Callable[[str, np.ndarray], Any] = cv2.imwrite,
+                 cache: Optional[DetectionCache] = None):
+    """Process a single image: detect faces, correct rotation, and save cropped faces.
+    
+    detection_np is a reduced-scale BGR decode used for face detection; it is
+    read from image_path when None. Full resolution is decoded only for crops.
+    """
+    crop_path = output_dir / image_path.name
+    
+    # Reuse an earlier run's detection (visualizations need the full result)
+    cache_key = None
+    if cache is not None and not visualize_results:
+        cache_key = cache.make_key(image_path)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            bbox, confidence, total_faces, rotation_angle = cached
+            if bbox is None:
+                logger.info("No faces detected in %s (cached)", image_path.name)
+                return
+            logger.info("Found %d face(s) in %s (cached)", total_faces, image_path.name)
+            image_np = cv2.imread(str(image_path))
+            if image_np is None:
+                logger.error("Error reading image: %s", image_path)
+                return
+            save_best_crop(best_face_crop(image_np, bbox, rotation_angle), rotation_angle, crop_path, write)
+            logger.info("  Saved highest confidence face (confidence: %.2f, %d faces detected) to %s", confidence, total_faces, crop_path)
+            return
     
-    # Read image
-    image_np = cv2.imread(str(image_path))
-    if image_np is None:
-        print(f"Error reading image: {image_path}")
+    # Detection only needs a reduced decode (libjpeg scales during the IDCT)
+    if detection_np is None:
+        detection_np = read_detection_image(image_path)
+    if detection_np is None:
+        logger.error("Error reading image: %s", image_path)
         return
     
-    original_height, original_width = image_np.shape[:2]
-    
-    # Create MediaPipe image for face detection
-    mp_image = mp.Image.create_from_file(str(image_path))
+    # Create MediaPipe image for face detection from the already-decoded pixels
+    mp_image, _ = to_detection_image(detection_np)
     
     # Detect faces first
     face_detection_result = face_detector.detect(mp_image)
     
     if not face_detection_result.detections:
-        print(f"No faces detected in {image_path.name}")
+        logger.info("No faces detected in %s", image_path.name)
+        if cache_key is not None:
+            cache.put(cache_key, None, 0.0, 0, 0.0)
         return
     
-    print(f"Found {len(face_detection_result.detections)} face(s) in {image_path.name}")
+    # Full-resolution pixels are decoded only once a face is known to be there
+    image_np = cv2.imread(str(image_path))
+    if image_np is None:
+        logger.error("Error reading image: %s", image_path)
+        return
     
-    # Detect landmarks for rotation calculation
-    landmark_result = face_landmarker.detect(mp_image)
+    original_height, original_width = image_np.shape[:2]
+    
+    # Map boxes from the detection image back to full resolution
+    rescale_detections(face_detection_result, mp_image.width / original_width)
+    
+    logger.info("Found %d face(s) in %s", len(face_detection_result.detections), image_path.name)
+    
+    # Find the highest confidence face from the flattened score column
+    det_arr = detections_to_array(face_detection_result.detections)
+    best_index = int(np.argmax(det_arr[:, 4]))
+    best_detection = face_detection_result.detections[best_index]
+    
+    # Cheap roll estimate from the detector's eye keypoints
+    keypoint_angle = estimate_keypoint_roll(best_detection, original_width, original_height)
     
     rotation_angle = 0.0
-    if landmark_result.face_landmarks and len(landmark_result.face_landmarks) > 0:
-        # Use the first face's landmarks
-        landmarks = landmark_result.face_landmarks[0]
-        rotation_angle = calculate_face_rotation(
-            landmarks, original_width, original_height, verbose)
+    if keypoint_angle is not None and abs(keypoint_angle) <= ROTATION_GATE:
+        # Near-upright face: the 468-landmark model would not change the outcome much
+        rotation_angle = keypoint_angle if abs(keypoint_angle) > 1.0 else 0.0
         if verbose:
-            print(f"  📊 Final rotation analysis complete")
-        else:
-            print(f"  Detected rotation: {rotation_angle:.1f}°")
-    
-    # Rotate the image if necessary
-    corrected_image = image_np
-    if abs(rotation_angle) > 1.0:
-        corrected_image = rotate_image(image_np, rotation_angle)
-        print(f"  Applied rotation correction: {rotation_angle:.1f}°")
-        
-        # Re-detect faces on the corrected image
-        corrected_mp_image = mp.Image(
-            image_format=mp.ImageFormat.SRGB,
-            data=cv2.cvtColor(corrected_image, cv2.COLOR_BGR2RGB)
-        )
-        face_detection_result = face_detector.detect(corrected_mp_image)
+            logger.info("    📐 Keypoint roll %+6.1f° within ±%.0f°, landmarker skipped", keypoint_angle, ROTATION_GATE)
+        logger.info("  Detected rotation: %.1f°", rotation_angle)
+    else:
+        # Detect landmarks for rotation calculation on a tile around the best face
+        landmarks = detect_tile_landmarks(face_landmarker, image_np, best_detection.bounding_box)
+        if landmarks is None:
+            # Fall back to the full frame when the tile misses the face
+            landmark_result = face_landmarker.detect(to_mp_image(image_np))
+            if landmark_result.face_landmarks:
+                landmarks = landmark_result.face_landmarks[0]
         
-        if not face_detection_result.detections:
-            print(f"  Warning: No faces detected after rotation correction")
-            return
+        if landmarks:
+            rotation_angle = calculate_face_rotation(
+                landmarks, original_width, original_height, verbose)
+            if verbose:
+                logger.info("  📊 Final rotation analysis complete")
+            logger.info("  Detected rotation: %.1f°", rotation_angle)
+    
+    # Rotation is folded into the crop, so detections stay in original coordinates.
+    # Crop before visualizing, so the visualization can draw on the frame itself
+    bbox = best_detection.bounding_box
+    cropped_face = best_face_crop(image_np, bbox, rotation_angle)
     
     # Save visualization if requested
     if visualize_results:
         vis_dir = output_dir / "visualizations"
         vis_dir.mkdir(parents=True, exist_ok=True)
         
-        # Convert BGR to RGB for visualization
-        image_rgb = cv2.cvtColor(corrected_image, cv2.COLOR_BGR2RGB)
-        annotated = visualize(image_rgb, face_detection_result)
-        # Convert back to BGR for saving
-        annotated_bgr = cv2.cvtColor(annotated, cv2.COLOR_RGB2BGR)
+        # Draw in BGR directly; imwrite expects BGR anyway
+        annotated_bgr = visualize(image_np, face_detection_result, bgr=True, inplace=True)
         
-        vis_path = vis_dir / f"{image_path.stem}_corrected.jpg"
-        cv2.imwrite(str(vis_path), annotated_bgr)
-        print(f"  Saved visualization to {vis_path}")
+        # Detections live in the unrotated frame, so that is what gets annotated
+        vis_path = vis_dir / f"{image_path.stem}_detected.jpg"
+        write(str(vis_path), annotated_bgr)
+        logger.info("  Saved visualization to %s", vis_path)
     
     # Crop and save only the highest confidence face
     if face_detection_result.detections:
-        # Find the highest confidence face
-        best_detection = max(face_detection_result.detections, 
-                           key=lambda d: d.categories[0].score if d.categories else 0.0)
-        
-        bbox = best_detection.bounding_box
-        cropped_face = crop_face(corrected_image, bbox)
-        
-        # Save cropped face with same name as original (500x500)
-        crop_path = output_dir / image_path.name
-        cv2.imwrite(str(crop_path), cropped_face)
+        save_best_crop(cropped_face, rotation_angle, crop_path, write)
         
         # Get confidence score
-        confidence = best_detection.categories[0].score if best_detection.categories else 0.0
+        confidence = det_arr[best_index, 4]
         total_faces = len(face_detection_result.detections)
-        print(f"  Saved highest confidence face (confidence: {confidence:.2f}, {total_faces} faces detected) to {crop_path}")
+        if cache_key is not None:
+            cache.put(cache_key, bbox, confidence, total_faces, rotation_angle)
+        logger.info("  Saved highest confidence face (confidence: %.2f, %d faces detected) to %s", confidence, total_faces, crop_path)
 
 
 def main():
@@ -354,12 +544,19 @@ def main():
                         help='Save visualization images with bounding boxes')
     parser.add_argument('--verbose', action='store_true',
                         help='Enable detailed logging of landmark detection and rotation calculation')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Ignore and do not update the detection cache ({CACHE_FILENAME} in the output directory)')
+    parser.add_argument('--jpeg-quality', type=int, default=JPEG_QUALITY,
+                        help=f'JPEG quality for saved images (default: {JPEG_QUALITY})')
     parser.add_argument('--extensions', nargs='+', 
                         default=['jpg', 'jpeg', 'png', 'bmp'],
                         help='Image file extensions to process')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(message)s', stream=sys.stdout)
+    
     # Validate input directory
     input_dir = Path(args.input_dir)
     if not input_dir.exists():
@@ -403,26 +600,60 @@ def main():
     face_landmarker = vision.FaceLandmarker.create_from_options(landmark_options)
     
     # Find all image files
-    image_files = []
-    for ext in args.extensions:
-        image_files.extend(input_dir.glob(f'*.{ext}'))
-        image_files.extend(input_dir.glob(f'*.{ext.upper()}'))
+    image_files = find_images(input_dir, args.extensions)
     
     if not image_files:
         print(f"No image files found in {input_dir} with extensions: {args.extensions}")
         sys.exit(1)
     
     print(f"Found {len(image_files)} image(s) to process")
+    
+    # Drop images whose header already rules out a face crop, before any decoding
+    candidates = [path for path in sorted(image_files) if is_croppable_size(path)]
+    if len(candidates) < len(image_files):
+        print(f"Skipping {len(image_files) - len(candidates)} image(s) smaller than "
+              f"{MIN_SHORT_EDGE}px or more elongated than {MAX_ASPECT_RATIO:g}:1")
     print("-" * 60)
     
-    # Process each image
-    for image_path in sorted(image_files):
+    # Detection cache lets re-runs on a growing directory skip inference
+    cache = None
+    if not args.no_cache:
+        cache = DetectionCache(output_dir / CACHE_FILENAME, args.confidence,
+                               (args.face_model_path, args.landmark_model_path))
+    
+    # Process each image: decoding runs ahead and writing runs behind the
+    # detector, which stays on this thread (MediaPipe tasks are not thread-safe)
+    pending_writes = []
+    with ThreadPoolExecutor(max_workers=DECODE_THREADS) as decode_pool, \
+            ThreadPoolExecutor(max_workers=WRITE_THREADS) as write_pool:
+        
+        def write_async(path: str, image: np.ndarray):
+            # Crops can be views into the decoded frame; hand the encoder its own
+            # copy so the frame is not pinned (or changed) while the write is queued
+            if image.base is not None:
+                image = image.copy()
+            params = encode_params(path, args.jpeg_quality)
+            pending_writes.append((path, write_pool.submit(cv2.imwrite, path, image, params)))
+        
+        for image_path, decoded in prefetch_images(candidates, decode_pool, read_detection_image):
+            try:
+                process_image(face_detector, face_landmarker, image_path, output_dir, 
+                             args.visualize, args.verbose,
+                             detection_np=decoded.result(), write=write_async,
+                             cache=cache)
+            except Exception as e:
+                logger.error("Error processing %s: %s", image_path, e)
+                continue
+    
+    if cache is not None:
+        cache.close()
+    
+    # Report writes that failed in the background
+    for path, future in pending_writes:
         try:
-            process_image(face_detector, face_landmarker, image_path, output_dir, 
-                         args.visualize, args.verbose)
+            future.result()
         except Exception as e:
-            print(f"Error processing {image_path}: {e}")
-            continue
+            logger.error("Error writing %s: %s", path, e)
     
     print("-" * 60)
     print(f"Processing complete. Results saved to {output_dir}")
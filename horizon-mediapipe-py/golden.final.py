@@ -6,11 +6,71 @@ Transforms technical golden.json metrics into human-friendly insights.
 
 import json
 import math
+import multiprocessing
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from pickle import PicklingError
+from typing import Dict, List, Optional, Tuple, Union, Any
 
+from common import dumps_json, list_by_suffix, load_json, positive_int, worker_count
 
 PHI = 1.61803398875  # Golden ratio constant
+MAP_CHUNKSIZE = 8  # files handed to a worker process at a time
+MANIFEST_FILENAME = 'interpretations.ndjson'  # --manifest output, in the landmarks directory
+
+
+def _interned(*labels: str) -> Tuple[str, ...]:
+    """Label tuple whose strings are interned, so every result shares one object per label."""
+    return tuple(sys.intern(label) for label in labels)
+
+
+def _istr(value: Any) -> Any:
+    """Intern categorical strings so rows share one object per distinct label."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Score bands, lowest first: a value at a threshold belongs to the band above it
+_PCT_THRESHOLDS = (0.45, 0.55, 0.65, 0.75, 0.85, 0.95)
+_PCT_LABELS = _interned("needs improvement", "fair", "moderate", "good", "very good", "excellent", "nearly perfect")
+
+# Deviation bands, smallest first: a deviation at a threshold belongs to the band below it
+_HARMONY_THRESHOLDS = (0.05, 0.15, 0.25, 0.40, 0.60)
+_HARMONY_LABELS = _interned(
+    "perfect golden ratio alignment",
+    "excellent harmony",
+    "good harmony",
+    "moderate harmony",
+    "some deviation from ideal",
+    "significant variation from golden ratio",
+)
+
+# Angle bands per feature (degrees); each bound closes the band below it
+_CANTHAL_BOUNDS = (5, 10)  # on the absolute tilt
+_CANTHAL_UP_LABELS = _interned("neutral", "slightly upward", "upward slanting")
+_CANTHAL_DOWN_LABELS = _interned("neutral", "slightly downward", "downward slanting")
+_NASOLABIAL_BOUNDS = (100, 110, 120)  # from 90
+_NASOLABIAL_LABELS = _interned("acute", "ideal", "slightly obtuse", "obtuse")
+_MANDIBULAR_BOUNDS = (120, 140)  # from 100
+_MANDIBULAR_LABELS = _interned("defined jawline", "soft jawline", "round jawline")
+
+# Stand-in for a missing or malformed section; shared, so never modified
+_EMPTY: Dict[str, Any] = {}
+
+# Per-side (metric keys..., feature names...) for the eye loops, left then right
+_EYE_SIDE_SPEC = (
+    ("canthal_tilt_deg_L", "fissure_length_L", "left_eye_tilt", "left_eye_size"),
+    ("canthal_tilt_deg_R", "fissure_length_R", "right_eye_tilt", "right_eye_size"),
+)
+_BROW_SIDE_SPEC = (
+    ("brow_height_L", "brow_slope_L", "left_brow_position", "left_brow_shape"),
+    ("brow_height_R", "brow_slope_R", "right_brow_position", "right_brow_shape"),
+)
 
 
 def interpret_value(value: float, ranges: List[Tuple[float, float, str]]) -> str:
@@ -23,85 +83,86 @@ def interpret_value(value: float, ranges: List[Tuple[float, float, str]]) -> str
 
 def percentage_to_description(value: float) -> str:
     """Convert percentage (0-1) to descriptive text."""
-    if value >= 0.95:
-        return "nearly perfect"
-    elif value >= 0.85:
-        return "excellent"
-    elif value >= 0.75:
-        return "very good"
-    elif value >= 0.65:
-        return "good"
-    elif value >= 0.55:
-        return "moderate"
-    elif value >= 0.45:
-        return "fair"
-    else:
-        return "needs improvement"
+    if math.isnan(value):  # NaN fails every comparison: lowest band
+        return _PCT_LABELS[0]
+    return _PCT_LABELS[bisect_right(_PCT_THRESHOLDS, value)]
 
 
 def deviation_to_harmony(deviation: float) -> str:
     """Convert deviation from golden ratio to harmony description."""
-    if deviation <= 0.05:
-        return "perfect golden ratio alignment"
-    elif deviation <= 0.15:
-        return "excellent harmony"
-    elif deviation <= 0.25:
-        return "good harmony"
-    elif deviation <= 0.40:
-        return "moderate harmony"
-    elif deviation <= 0.60:
-        return "some deviation from ideal"
-    else:
-        return "significant variation from golden ratio"
+    if math.isnan(deviation):  # NaN fails every comparison: largest deviation
+        return _HARMONY_LABELS[-1]
+    return _HARMONY_LABELS[bisect_left(_HARMONY_THRESHOLDS, deviation)]
+
+
+def _canthal_tilt(angle: float) -> str:
+    if math.isnan(angle):
+        return "downward slanting"
+    # Bands are symmetric about zero, with the boundaries belonging to the milder band
+    labels = _CANTHAL_UP_LABELS if angle >= 0 else _CANTHAL_DOWN_LABELS
+    return labels[bisect_left(_CANTHAL_BOUNDS, abs(angle))]
+
+
+def _nasolabial(angle: float) -> str:
+    if not angle >= 90:  # below the table, or NaN
+        return "obtuse"
+    return _NASOLABIAL_LABELS[bisect_left(_NASOLABIAL_BOUNDS, angle)]
+
+
+def _mandibular(angle: float) -> str:
+    if angle < 100:
+        return "sharp jawline"
+    if math.isnan(angle):
+        return "round jawline"
+    return _MANDIBULAR_LABELS[bisect_left(_MANDIBULAR_BOUNDS, angle)]
+
+
+_ANGLE_DISPATCH = {
+    "canthal_tilt": _canthal_tilt,
+    "nasolabial": _nasolabial,
+    "mandibular": _mandibular,
+}
 
 
 def angle_to_description(angle: float, feature: str) -> str:
     """Convert angle measurements to descriptions based on feature type."""
-    if feature == "canthal_tilt":
-        if -5 <= angle <= 5:
-            return "neutral"
-        elif 5 < angle <= 10:
-            return "slightly upward"
-        elif angle > 10:
-            return "upward slanting"
-        elif -10 <= angle < -5:
-            return "slightly downward"
-        else:
-            return "downward slanting"
-    elif feature == "nasolabial":
-        if 90 <= angle <= 100:
-            return "acute"
-        elif 100 < angle <= 110:
-            return "ideal"
-        elif 110 < angle <= 120:
-            return "slightly obtuse"
-        else:
-            return "obtuse"
-    elif feature == "mandibular":
-        if angle < 100:
-            return "sharp jawline"
-        elif 100 <= angle <= 120:
-            return "defined jawline"
-        elif 120 < angle <= 140:
-            return "soft jawline"
-        else:
-            return "round jawline"
+    describe = _ANGLE_DISPATCH.get(feature)
+    if describe is not None:
+        return describe(angle)
     return f"{angle:.0f} degrees"
 
 
+def _whole_percent(fraction: float) -> float:
+    """fraction as the whole percentage that f"{fraction:.0%}" displays (NaN and infinities pass through)."""
+    percent = fraction * 100
+    return round(percent) if math.isfinite(percent) else percent
+
+
+@lru_cache(maxsize=256)
+def _clean_ratio_name(ratio_name: str) -> str:
+    """Readable feature name for a phi deviation key (a small, fixed vocabulary)."""
+    return ratio_name.replace('_phi_deviation', '').replace('_', ' ')
+
+
+def _section(data: Dict, key: str) -> Dict:
+    """data[key] when it is a dict, else an empty stand-in."""
+    section = data.get(key)
+    return section if isinstance(section, dict) else _EMPTY
+
+
+def _metric(section: Dict, key: str) -> Optional[Any]:
+    """The 'value' of section[key], or None when it is missing or not a dict."""
+    entry = section.get(key)
+    return entry.get('value') if isinstance(entry, dict) else None
+
+
 class GoldenInterpreter:
+    __slots__ = ('data', 'insights')
+    
     def __init__(self, golden_data: Dict):
         self.data = golden_data
-        self.insights = {
-            "summary": {},
-            "facial_harmony": {},
-            "prominent_features": {},
-            "proportions": {},
-            "symmetry": {},
-            "golden_ratio_alignment": {},
-            "distinctive_characteristics": [],
-            "overall_assessment": ""
-        }
+        # Sections are added as the analyzers find data for them
+        self.insights = {}
     
     def interpret(self) -> Dict:
         """Generate human-friendly interpretation of golden ratio analysis."""
@@ -116,35 +177,25 @@ class GoldenInterpreter:
         
         return self.insights
     
-    def _safe_get(self, *keys, default=None):
-        """Safely navigate nested dictionaries."""
-        current = self.data
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return default
-        return current
-    
     def _analyze_facial_harmony(self):
         """Analyze overall facial harmony metrics."""
+        diagnostics = _section(self.data, 'golden_diagnostics')
+        facial_harmony = {}
         harmony_scores = []
         
         # Thirds evenness
-        thirds = self._safe_get('golden_diagnostics', 'thirds_evenness', 'value')
-        if thirds is not None:
+        if (thirds := _metric(diagnostics, 'thirds_evenness')) is not None:
             harmony_scores.append(thirds)
-            self.insights['facial_harmony']['vertical_balance'] = {
+            facial_harmony['vertical_balance'] = {
                 'score': f"{thirds:.0%}",
                 'interpretation': percentage_to_description(thirds),
                 'meaning': "How evenly the face divides into upper, middle, and lower thirds"
             }
         
         # Fifths evenness
-        fifths = self._safe_get('golden_diagnostics', 'fifths_evenness', 'value')
-        if fifths is not None:
+        if (fifths := _metric(diagnostics, 'fifths_evenness')) is not None:
             harmony_scores.append(fifths)
-            self.insights['facial_harmony']['horizontal_balance'] = {
+            facial_harmony['horizontal_balance'] = {
                 'score': f"{fifths:.0%}",
                 'interpretation': percentage_to_description(fifths),
                 'meaning': "How evenly the face divides into five equal vertical sections"
@@ -153,39 +204,40 @@ class GoldenInterpreter:
         # Calculate overall harmony
         if harmony_scores:
             avg_harmony = sum(harmony_scores) / len(harmony_scores)
-            self.insights['summary']['facial_harmony_score'] = f"{avg_harmony:.0%}"
-            self.insights['summary']['harmony_level'] = percentage_to_description(avg_harmony)
+            self.insights['summary'] = {
+                'facial_harmony_score': f"{avg_harmony:.0%}",
+                'harmony_level': percentage_to_description(avg_harmony)
+            }
+        
+        if facial_harmony:
+            self.insights['facial_harmony'] = facial_harmony
     
     def _analyze_eyes(self):
         """Analyze eye-related features."""
-        eyes = self._safe_get('eyes', default={})
+        eyes = _section(self.data, 'eyes')
         if not eyes:
             return
         
         eye_features = {}
         
         # Eye shape and tilt
-        for side in ['L', 'R']:
-            side_name = 'left' if side == 'L' else 'right'
-            
-            tilt = self._safe_get('eyes', f'canthal_tilt_deg_{side}', 'value')
-            if tilt is not None:
-                eye_features[f'{side_name}_eye_tilt'] = angle_to_description(tilt, 'canthal_tilt')
+        for tilt_key, fissure_key, tilt_name, size_name in _EYE_SIDE_SPEC:
+            if (tilt := _metric(eyes, tilt_key)) is not None:
+                eye_features[tilt_name] = angle_to_description(tilt, 'canthal_tilt')
             
-            fissure = self._safe_get('eyes', f'fissure_length_{side}', 'value')
-            if fissure is not None:
+            if (fissure := _metric(eyes, fissure_key)) is not None:
                 if fissure > 0.6:
-                    eye_features[f'{side_name}_eye_size'] = "large"
+                    eye_features[size_name] = "large"
                 elif fissure > 0.4:
-                    eye_features[f'{side_name}_eye_size'] = "medium"
+                    eye_features[size_name] = "medium"
                 else:
-                    eye_features[f'{side_name}_eye_size'] = "petite"
+                    eye_features[size_name] = "petite"
         
         # Intercanthal ratio
-        intercanthal = self._safe_get('eyes', 'intercanthal_over_eye_width', 'value')
+        intercanthal = _metric(eyes, 'intercanthal_over_eye_width')
         if intercanthal is None:
             # Fallback to old name
-            intercanthal = self._safe_get('eyes', 'intercanthal_over_IPD', 'value')
+            intercanthal = _metric(eyes, 'intercanthal_over_IPD')
         if intercanthal is not None:
             if 0.28 <= intercanthal <= 0.35:  # Adjusted for eye width ratio
                 eye_features['eye_spacing'] = "ideally spaced"
@@ -195,43 +247,39 @@ class GoldenInterpreter:
                 eye_features['eye_spacing'] = "wide-set"
         
         # Brow characteristics
-        for side in ['L', 'R']:
-            side_name = 'left' if side == 'L' else 'right'
-            
-            brow_height = self._safe_get('eyes', f'brow_height_{side}', 'value')
-            if brow_height is not None:
+        for height_key, slope_key, position_name, shape_name in _BROW_SIDE_SPEC:
+            if (brow_height := _metric(eyes, height_key)) is not None:
                 if brow_height > 0.6:
-                    eye_features[f'{side_name}_brow_position'] = "high"
+                    eye_features[position_name] = "high"
                 elif brow_height > 0.4:
-                    eye_features[f'{side_name}_brow_position'] = "medium"
+                    eye_features[position_name] = "medium"
                 else:
-                    eye_features[f'{side_name}_brow_position'] = "low"
+                    eye_features[position_name] = "low"
             
-            brow_slope = self._safe_get('eyes', f'brow_slope_{side}', 'value')
-            if brow_slope is not None:
+            if (brow_slope := _metric(eyes, slope_key)) is not None:
                 if abs(brow_slope) < 0.1:
-                    eye_features[f'{side_name}_brow_shape'] = "straight"
+                    eye_features[shape_name] = "straight"
                 elif brow_slope > 0:
-                    eye_features[f'{side_name}_brow_shape'] = "arched"
+                    eye_features[shape_name] = "arched"
                 else:
-                    eye_features[f'{side_name}_brow_shape'] = "angled"
+                    eye_features[shape_name] = "angled"
         
         if eye_features:
-            self.insights['prominent_features']['eyes'] = eye_features
+            self.insights.setdefault('prominent_features', {})['eyes'] = eye_features
     
     def _analyze_nose(self):
         """Analyze nose characteristics."""
-        nose = self._safe_get('nose', default={})
+        nose = _section(self.data, 'nose')
         if not nose:
             return
         
         nose_features = {}
         
         # Nasal width
-        alar_width = self._safe_get('nose', 'alar_width_over_inter_eye', 'value')
+        alar_width = _metric(nose, 'alar_width_over_inter_eye')
         if alar_width is None:
             # Fallback to old name
-            alar_width = self._safe_get('nose', 'alar_width_over_IPD', 'value')
+            alar_width = _metric(nose, 'alar_width_over_IPD')
         if alar_width is not None:
             if alar_width < 1.3:
                 nose_features['width'] = "narrow"
@@ -241,8 +289,7 @@ class GoldenInterpreter:
                 nose_features['width'] = "wide"
         
         # Nasal length
-        nasal_length = self._safe_get('nose', 'nasal_length_over_face_height', 'value')
-        if nasal_length is not None:
+        if (nasal_length := _metric(nose, 'nasal_length_over_face_height')) is not None:
             if nasal_length < 0.43:
                 nose_features['length'] = "short"
             elif nasal_length < 0.47:
@@ -251,8 +298,7 @@ class GoldenInterpreter:
                 nose_features['length'] = "long"
         
         # Tip projection
-        tip_projection = self._safe_get('nose', 'tip_projection_3D_over_IPD', 'value')
-        if tip_projection is not None:
+        if (tip_projection := _metric(nose, 'tip_projection_3D_over_IPD')) is not None:
             if tip_projection < 0.25:
                 nose_features['projection'] = "low profile"
             elif tip_projection < 0.35:
@@ -261,24 +307,22 @@ class GoldenInterpreter:
                 nose_features['projection'] = "prominent"
         
         # Nasolabial angle
-        nasolabial = self._safe_get('nose', 'nasal_tip_to_upper_lip_angle_deg', 'value')
-        if nasolabial is not None:
+        if (nasolabial := _metric(nose, 'nasal_tip_to_upper_lip_angle_deg')) is not None:
             nose_features['tip_angle'] = angle_to_description(nasolabial, 'nasolabial')
         
         if nose_features:
-            self.insights['prominent_features']['nose'] = nose_features
+            self.insights.setdefault('prominent_features', {})['nose'] = nose_features
     
     def _analyze_mouth(self):
         """Analyze mouth and lip characteristics."""
-        mouth = self._safe_get('mouth', default={})
+        mouth = _section(self.data, 'mouth')
         if not mouth:
             return
         
         mouth_features = {}
         
         # Mouth width
-        mouth_width = self._safe_get('mouth', 'mouth_width_over_IPD', 'value')
-        if mouth_width is not None:
+        if (mouth_width := _metric(mouth, 'mouth_width_over_IPD')) is not None:
             if mouth_width < 1.4:
                 mouth_features['width'] = "small"
             elif mouth_width < 1.6:
@@ -287,8 +331,7 @@ class GoldenInterpreter:
                 mouth_features['width'] = "full"
         
         # Lip ratio
-        lip_ratio = self._safe_get('mouth', 'upper_to_lower_lip_ratio', 'value')
-        if lip_ratio is not None:
+        if (lip_ratio := _metric(mouth, 'upper_to_lower_lip_ratio')) is not None:
             if 0.9 <= lip_ratio <= 1.1:
                 mouth_features['lip_balance'] = "balanced"
             elif lip_ratio < 0.9:
@@ -297,8 +340,7 @@ class GoldenInterpreter:
                 mouth_features['lip_balance'] = "fuller upper lip"
         
         # Smile arc
-        smile_arc = self._safe_get('mouth', 'smile_arc_curvature', 'value')
-        if smile_arc is not None:
+        if (smile_arc := _metric(mouth, 'smile_arc_curvature')) is not None:
             if smile_arc < 50:
                 mouth_features['smile_type'] = "subtle"
             elif smile_arc < 150:
@@ -307,8 +349,7 @@ class GoldenInterpreter:
                 mouth_features['smile_type'] = "pronounced curve"
         
         # Cupid's bow
-        cupid_bow = self._safe_get('mouth', 'cupid_bow_depth', 'value')
-        if cupid_bow is not None:
+        if (cupid_bow := _metric(mouth, 'cupid_bow_depth')) is not None:
             if cupid_bow < 0.2:
                 mouth_features['cupids_bow'] = "subtle"
             elif cupid_bow < 0.4:
@@ -317,19 +358,18 @@ class GoldenInterpreter:
                 mouth_features['cupids_bow'] = "pronounced"
         
         if mouth_features:
-            self.insights['prominent_features']['mouth'] = mouth_features
+            self.insights.setdefault('prominent_features', {})['mouth'] = mouth_features
     
     def _analyze_face_shape(self):
         """Analyze overall face shape and structure."""
-        structure = self._safe_get('structure', default={})
+        structure = _section(self.data, 'structure')
         if not structure:
             return
         
         face_shape = {}
         
         # Face height to width ratio
-        ratio = self._safe_get('structure', 'face_height_over_width', 'value')
-        if ratio is not None:
+        if (ratio := _metric(structure, 'face_height_over_width')) is not None:
             if ratio < 1.3:
                 face_shape['overall_shape'] = "round or square"
             elif ratio < 1.5:
@@ -340,13 +380,11 @@ class GoldenInterpreter:
                 face_shape['overall_shape'] = "long"
         
         # Jawline
-        mandibular = self._safe_get('structure', 'mandibular_angle_deg', 'value')
-        if mandibular is not None:
+        if (mandibular := _metric(structure, 'mandibular_angle_deg')) is not None:
             face_shape['jawline'] = angle_to_description(mandibular, 'mandibular')
         
         # Chin prominence
-        chin = self._safe_get('structure', 'chin_prominence_3D', 'value')
-        if chin is not None:
+        if (chin := _metric(structure, 'chin_prominence_3D')) is not None:
             if chin < 0.2:
                 face_shape['chin'] = "recessed"
             elif chin < 0.35:
@@ -355,8 +393,8 @@ class GoldenInterpreter:
                 face_shape['chin'] = "prominent"
         
         # Facial thirds analysis
-        upper_third = self._safe_get('structure', 'upper_to_middle_third', 'value')
-        lower_third = self._safe_get('structure', 'lower_to_middle_third', 'value')
+        upper_third = _metric(structure, 'upper_to_middle_third')
+        lower_third = _metric(structure, 'lower_to_middle_third')
         
         if upper_third is not None and lower_third is not None:
             # Ideal is close to 1.0 for both
@@ -370,19 +408,18 @@ class GoldenInterpreter:
                 face_shape['vertical_proportions'] = "unique proportions"
         
         if face_shape:
-            self.insights['proportions']['face_shape'] = face_shape
+            self.insights['proportions'] = {'face_shape': face_shape}
     
     def _analyze_symmetry(self):
         """Analyze facial symmetry."""
-        symmetry = self._safe_get('symmetry', default={})
+        symmetry = _section(self.data, 'symmetry')
         if not symmetry:
             return
         
         symmetry_analysis = {}
         
         # Overall symmetry score
-        symmetry_score = self._safe_get('symmetry', 'midline_symmetry_score', 'value')
-        if symmetry_score is not None:
+        if (symmetry_score := _metric(symmetry, 'midline_symmetry_score')) is not None:
             # Convert to positive percentage
             if symmetry_score < 0:
                 symmetry_score = 0
@@ -393,16 +430,19 @@ class GoldenInterpreter:
             symmetry_analysis['level'] = percentage_to_description(symmetry_score)
         
         # Bilateral feature analysis
-        deltas = self._safe_get('symmetry', 'bilateral_feature_deltas', default={})
+        deltas = symmetry.get('bilateral_feature_deltas')
         if deltas:
+            # Only the first three are reported, so stop looking once they are found
             asymmetries = []
             for feature, delta in deltas.items():
                 if delta > 0.5:  # Significant asymmetry threshold
                     feature_name = feature.replace('_vs_', ' vs ').replace('_', ' ')
                     asymmetries.append(feature_name)
+                    if len(asymmetries) == 3:
+                        break
             
             if asymmetries:
-                symmetry_analysis['notable_asymmetries'] = asymmetries[:3]  # Top 3
+                symmetry_analysis['notable_asymmetries'] = asymmetries
             else:
                 symmetry_analysis['notable_asymmetries'] = ["highly symmetric features"]
         
@@ -411,39 +451,31 @@ class GoldenInterpreter:
     
     def _analyze_golden_ratios(self):
         """Analyze golden ratio alignments."""
-        phi_deviations = self._safe_get('golden_diagnostics', 'phi_deviations', default={})
+        phi_deviations = _section(_section(self.data, 'golden_diagnostics'), 'phi_deviations')
         if not phi_deviations:
             return
         
-        golden_analysis = {}
-        alignments = []
-        
-        for ratio_name, data in phi_deviations.items():
-            if isinstance(data, dict) and 'value' in data:
-                deviation = data['value']
-                
-                # Clean up ratio name
-                clean_name = ratio_name.replace('_phi_deviation', '').replace('_', ' ')
-                
-                harmony = deviation_to_harmony(deviation)
-                alignments.append({
-                    'feature': clean_name,
-                    'alignment': harmony,
-                    'deviation': f"{deviation:.0%}"
-                })
-        
-        # Sort by best alignment
-        alignments.sort(key=lambda x: float(x['deviation'].rstrip('%')))
-        
-        if alignments:
-            golden_analysis['best_alignment'] = alignments[0]
-            golden_analysis['all_alignments'] = alignments
+        # (displayed whole percent, raw deviation, ratio name), sorted by best alignment on
+        # the percentage that is shown, so ties keep their order; each is banded on its raw value
+        deviations = [(_whole_percent(data['value']), data['value'], ratio_name)
+                      for ratio_name, data in phi_deviations.items()
+                      if isinstance(data, dict) and 'value' in data]
+        deviations.sort(key=itemgetter(0))
+        
+        if deviations:
+            alignments = [{
+                'feature': _clean_ratio_name(ratio_name),
+                'alignment': deviation_to_harmony(deviation),
+                'deviation': f"{deviation:.0%}"
+            } for _, deviation, ratio_name in deviations]
             
-            # Calculate overall golden ratio score
-            avg_deviation = sum(float(a['deviation'].rstrip('%'))/100 for a in alignments) / len(alignments)
-            golden_analysis['overall_harmony'] = deviation_to_harmony(avg_deviation)
-        
-        self.insights['golden_ratio_alignment'] = golden_analysis
+            # Calculate overall golden ratio score from the displayed percentages
+            avg_deviation = sum(percent / 100 for percent, _, _ in deviations) / len(deviations)
+            self.insights['golden_ratio_alignment'] = {
+                'best_alignment': alignments[0],
+                'all_alignments': alignments,
+                'overall_harmony': deviation_to_harmony(avg_deviation)
+            }
     
     def _generate_overall_assessment(self):
         """Generate comprehensive assessment."""
@@ -455,37 +487,39 @@ class GoldenInterpreter:
         if harmony:
             assessments.append(f"Facial harmony: {harmony}")
         
+        # These read golden.json itself, where proportions, prominent_features and
+        # golden_ratio_alignment are not sections, so they are normally absent
+        data = self.data
+        proportions = _section(data, 'proportions')
+        
         # Face shape
-        shape = self._safe_get('proportions', 'face_shape', 'overall_shape')
+        shape = _section(proportions, 'face_shape').get('overall_shape')
         if shape:
             distinctive.append(f"{shape} face shape")
         
         # Eye characteristics
-        eye_spacing = self._safe_get('prominent_features', 'eyes', 'eye_spacing')
+        eye_spacing = _section(_section(data, 'prominent_features'), 'eyes').get('eye_spacing')
         if eye_spacing:
             distinctive.append(f"{eye_spacing} eyes")
         
         # Jawline
-        jawline = self._safe_get('proportions', 'face_shape', 'jawline')
+        jawline = _section(proportions, 'face_shape').get('jawline')
         if jawline:
             distinctive.append(jawline)
         
         # Golden ratio
-        golden_harmony = self._safe_get('golden_ratio_alignment', 'overall_harmony')
+        golden_harmony = _section(data, 'golden_ratio_alignment').get('overall_harmony')
         if golden_harmony:
             assessments.append(f"Golden ratio: {golden_harmony}")
         
         # Symmetry
-        symmetry_level = self._safe_get('symmetry', 'level')
+        symmetry_level = _section(data, 'symmetry').get('level')
         if symmetry_level:
             assessments.append(f"Symmetry: {symmetry_level}")
         
-        # Build overall assessment
-        if assessments:
-            self.insights['overall_assessment'] = ". ".join(assessments)
-        
-        if distinctive:
-            self.insights['distinctive_characteristics'] = distinctive
+        # Build overall assessment (always present, if empty)
+        self.insights['distinctive_characteristics'] = distinctive
+        self.insights['overall_assessment'] = ". ".join(assessments)
         
         # Add interpretation guide
         self.insights['interpretation_note'] = (
@@ -495,16 +529,16 @@ class GoldenInterpreter:
         )
 
 
-def process_golden_file(filepath: str) -> Dict:
+def process_golden_file(filepath: Union[str, Path]) -> Dict:
     """Process a single .golden.json file and create human-friendly interpretation."""
+    source = str(filepath)
     try:
-        with open(filepath, 'r') as f:
-            golden_data = json.load(f)
+        golden_data = load_json(filepath)
         
         # Skip failed analyses
         if 'error' in golden_data:
             return {
-                'source_file': filepath,
+                'source_file': source,
                 'status': 'skipped',
                 'reason': golden_data.get('error', 'Unknown error')
             }
@@ -515,7 +549,7 @@ def process_golden_file(filepath: str) -> Dict:
         
         # Add metadata
         insights['metadata'] = {
-            'source_golden_file': filepath,
+            'source_golden_file': source,
             'original_landmark_file': golden_data.get('source_file', 'unknown'),
             'analysis_version': '1.0'
         }
@@ -524,24 +558,54 @@ def process_golden_file(filepath: str) -> Dict:
         
     except Exception as e:
         return {
-            'source_file': filepath,
+            'source_file': source,
             'status': 'failed',
             'error': str(e)
         }
 
 
-def process_all_golden_files(directory: str = 'landmarks') -> None:
-    """Process all .golden.json files in directory."""
+def interpret_golden_file(filepath: Path, compact: bool = False, save: bool = True) -> Tuple[Dict, str]:
+    """Interpret one .golden.json file and, if save, write the result beside it as .golden.final.json.
+    
+    Returns:
+        The interpretation and the name of its .golden.final.json file
+    """
+    result = process_golden_file(filepath)
+    
+    # Save individual interpretation
+    output_path = filepath.with_suffix('.final.json')
+    if save:
+        output_path.write_bytes(dumps_json(result, compact))
+    
+    return result, output_path.name
+
+
+def _fork_context() -> Optional[multiprocessing.context.BaseContext]:
+    """Return the fork start method's context, or None where the platform has no fork."""
+    # This file cannot be imported by name (the dot in golden.final.py), so spawned
+    # workers could never re-import interpret_golden_file; forked ones inherit it
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
+
+def process_all_golden_files(directory: str = 'landmarks', jobs: Optional[int] = None,
+                             compact: bool = False, manifest: bool = False) -> None:
+    """Process all .golden.json files in directory, using up to jobs processes (default: serially).
+    
+    With compact, output JSON is written without indentation. With manifest, the
+    interpretations go to one NDJSON file (MANIFEST_FILENAME, one line per input)
+    instead of a .golden.final.json file each.
+    """
     landmark_dir = Path(directory)
     
     if not landmark_dir.exists():
         print(f"Directory {directory} does not exist")
         return
     
-    golden_files = list(landmark_dir.glob('*.golden.json'))
-    
-    # Exclude summary file
-    golden_files = [f for f in golden_files if 'summary' not in f.name]
+    # One directory scan, excluding the summary file
+    golden_files = [path for path in list_by_suffix(landmark_dir, ('.golden.json',))['.golden.json']
+                    if 'summary' not in path.name]
     
     if not golden_files:
         print(f"No .golden.json files found in {directory}")
@@ -550,61 +614,105 @@ def process_all_golden_files(directory: str = 'landmarks') -> None:
     print(f"Found {len(golden_files)} golden analysis files")
     print("Generating human-friendly interpretations...")
     
-    results = []
-    for filepath in golden_files:
-        print(f"  Processing {filepath.name}...")
-        result = process_golden_file(str(filepath))
-        
-        # Save individual interpretation
-        output_path = filepath.with_suffix('.final.json')
-        output_path = Path(str(output_path).replace('.golden.final.json', '.golden.final.json'))
-        
-        with open(output_path, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        results.append(result)
-        
-        if 'error' not in result and result.get('status') != 'failed':
-            print(f"    ✓ Created {output_path.name}")
+    # Files are independent, so interpret them across processes; map keeps the
+    # input order, so the progress lines and summary read as for a serial run
+    interpret = partial(interpret_golden_file, compact=compact, save=not manifest)
+    workers = worker_count(jobs, 1, len(golden_files))
+    outcomes = None
+    if workers > 1:
+        context = _fork_context()
+        if context is None:
+            print("Worker processes need the 'fork' start method; interpreting serially",
+                  file=sys.stderr)
         else:
-            print(f"    ✗ Skipped: {result.get('reason', result.get('error', 'Unknown'))}")
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                    outcomes = list(executor.map(interpret, golden_files, chunksize=MAP_CHUNKSIZE))
+            except (BrokenProcessPool, PicklingError, OSError) as e:
+                # e.g. a loader that did not register this module in sys.modules;
+                # interpreting is idempotent, so the serial pass below just redoes it
+                print(f"Worker processes failed ({e!r}); interpreting serially", file=sys.stderr)
+                outcomes = None
+    if outcomes is None:
+        outcomes = [interpret(filepath) for filepath in golden_files]
+    
+    # Summary rows are collected as results come in, not in a second pass
+    summary_rows = []
+    manifest_path = landmark_dir / MANIFEST_FILENAME
+    with open(manifest_path, 'wb') if manifest else nullcontext() as manifest_file:
+        for filepath, (result, output_name) in zip(golden_files, outcomes):
+            print(f"  Processing {filepath.name}...")
+            if manifest_file is not None:
+                manifest_file.write(dumps_json(result, compact=True) + b'\n')
+            
+            if 'error' not in result and result.get('status') != 'failed':
+                if manifest_file is not None:
+                    print(f"    ✓ Added to {manifest_path.name}")
+                else:
+                    print(f"    ✓ Created {output_name}")
+                summary_rows.append({
+                    'file': result.get('metadata', {}).get('original_landmark_file', 'unknown'),
+                    'overall_assessment': result.get('overall_assessment', 'No assessment'),
+                    # Results from worker processes arrive as fresh copies of the same few
+                    # labels; interning shares them again across the summary
+                    'harmony_score': _istr(result.get('summary', {}).get('facial_harmony_score', 'N/A')),
+                    'distinctive_features': [_istr(feature) for feature in
+                                             result.get('distinctive_characteristics', [])]
+                })
+            else:
+                print(f"    ✗ Skipped: {result.get('reason', result.get('error', 'Unknown'))}")
     
     # Create summary of all interpretations
     summary = {
-        'total_analyzed': len(results),
-        'successful': sum(1 for r in results if 'error' not in r and r.get('status') != 'failed'),
-        'interpretation_summaries': []
+        'total_analyzed': len(outcomes),
+        'successful': len(summary_rows),
+        'interpretation_summaries': summary_rows
     }
     
-    for result in results:
-        if 'error' not in result and result.get('status') != 'failed':
-            summary['interpretation_summaries'].append({
-                'file': result.get('metadata', {}).get('original_landmark_file', 'unknown'),
-                'overall_assessment': result.get('overall_assessment', 'No assessment'),
-                'harmony_score': result.get('summary', {}).get('facial_harmony_score', 'N/A'),
-                'distinctive_features': result.get('distinctive_characteristics', [])
-            })
-    
     # Save summary
     summary_path = landmark_dir / 'golden_interpretations_summary.json'
-    with open(summary_path, 'w') as f:
-        json.dump(summary, f, indent=2)
+    summary_path.write_bytes(dumps_json(summary, compact))
     
     print(f"\nSummary saved to {summary_path}")
-    print(f"Successfully interpreted {summary['successful']}/{len(results)} files")
+    print(f"Successfully interpreted {summary['successful']}/{summary['total_analyzed']} files")
 
 
 def main():
     """Main entry point for processing golden ratio interpretations."""
-    import sys
+    import argparse
+    
+    # Usually run after golden.py, with the landmarks directory as the argument
+    parser = argparse.ArgumentParser(
+        description="Generate human-friendly interpretations of .golden.json files"
+    )
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default="landmarks",
+        help="Directory containing .golden.json files (default: landmarks)"
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes (default: interpret serially)"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON without indentation (smaller and faster to write)"
+    )
+    parser.add_argument(
+        "--manifest",
+        action="store_true",
+        help=f"Write all interpretations to {MANIFEST_FILENAME} (one JSON object per line) "
+             "instead of one .golden.final.json per image"
+    )
     
-    # Check if being run after golden.py
-    if len(sys.argv) > 1:
-        directory = sys.argv[1]
-    else:
-        directory = 'landmarks'
+    args = parser.parse_args()
     
-    process_all_golden_files(directory)
+    process_all_golden_files(args.directory, args.jobs, args.compact, args.manifest)
 
 
 if __name__ == '__main__':
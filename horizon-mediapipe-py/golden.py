@@ -4,15 +4,30 @@ MediaPipe Face Mesh Landmark Analysis with Golden Ratio Diagnostics
 Pure computation using stdlib + numpy for scale-invariant facial geometry extraction.
 """
 
+import copy
 import json
 import math
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import chain, compress
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple, Union, Any
 import numpy as np
 
+from common import dumps_json, load_json, worker_count
+
 
 PHI = 1.61803398875  # Golden ratio constant
+RESULT_CACHE_SIZE = 64  # Distinct inputs memoized by analyze_face_ratios
+MAP_CHUNKSIZE = 8  # files handed to a worker process at a time
+SIDECAR_SUFFIX = '.npz'  # binary copy of a .landmark file's first face, beside it
+
+# Per-landmark fields of a .landmark file, in array column order
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility', 'presence')
 
 # Fallback indices for MediaPipe Face Mesh
 FALLBACK_INDICES = {
@@ -47,12 +62,42 @@ FALLBACK_INDICES = {
     'R_cheek': 425
 }
 
+# Fallback names in a fixed order, their row in the gathered point matrix,
+# and their landmark indices as one array for a single-gather lookup
+NAME_ORDER = tuple(FALLBACK_INDICES)
+NAME_POS = {name: i for i, name in enumerate(NAME_ORDER)}
+NAME_IDX = np.fromiter(FALLBACK_INDICES.values(), dtype=np.int32, count=len(FALLBACK_INDICES))
+
+# Landmark name -> point, None when missing or below the visibility gate
+NamedPoints = Dict[str, Optional[np.ndarray]]
+
+# Attribute view of the fallback indices for fixed lookups (IDX.L_eye_outer)
+IDX = SimpleNamespace(**FALLBACK_INDICES)
+
+# Bounded LRU of analyze_face_ratios results keyed on the landmark arrays
+_result_cache: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+
+
+def dist2d(p1: np.ndarray, p2: np.ndarray) -> float:
+    """Calculate Euclidean distance between two points in the x/y plane."""
+    dx = float(p1[0]) - float(p2[0])
+    dy = float(p1[1]) - float(p2[1])
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def dist3d(p1: np.ndarray, p2: np.ndarray) -> float:
+    """Calculate Euclidean distance between two 3D points."""
+    dx = float(p1[0]) - float(p2[0])
+    dy = float(p1[1]) - float(p2[1])
+    dz = float(p1[2]) - float(p2[2])
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
 
 def dist(p1: np.ndarray, p2: np.ndarray, mode: str = '2D') -> float:
-    """Calculate Euclidean distance between two points."""
+    """Calculate Euclidean distance between two points (prefer dist2d/dist3d)."""
     if mode == '2D':
-        return np.linalg.norm(p1[:2] - p2[:2])
-    return np.linalg.norm(p1 - p2)
+        return dist2d(p1, p2)
+    return dist3d(p1, p2)
 
 
 def safe_ratio(num: float, denom: float, eps: float = 1e-8) -> Optional[float]:
@@ -71,11 +116,30 @@ def angle_deg(p1: np.ndarray, vertex: np.ndarray, p2: np.ndarray) -> float:
     return np.degrees(np.arccos(cos_angle))
 
 
+def pairwise_dist2d(points: np.ndarray) -> np.ndarray:
+    """Calculate the matrix of 2D distances between all rows of a [..., N, 3] array."""
+    diff = points[..., :, None, :2] - points[..., None, :, :2]
+    # Fused multiply-and-sum; the Gram form |x|^2 + |y|^2 - 2x.y would skip the
+    # difference tensor but cancels catastrophically in float32 for nearby points
+    return np.sqrt(np.einsum('...k,...k->...', diff, diff))
+
+
+def vertex_angles_deg(triples: np.ndarray) -> np.ndarray:
+    """Calculate angles in degrees at the vertex of each (p1, vertex, p2) row of a [..., K, 3, 3] array."""
+    v1 = triples[..., 0, :] - triples[..., 1, :]
+    v2 = triples[..., 2, :] - triples[..., 1, :]
+    norm1 = np.sqrt(np.einsum('...j,...j->...', v1, v1))
+    norm2 = np.sqrt(np.einsum('...j,...j->...', v2, v2))
+    cos_angle = np.einsum('...j,...j->...', v1, v2) / (norm1 * norm2 + 1e-8)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+
 def polyfit_curvature(points: np.ndarray, degree: int = 2) -> float:
     """Estimate curvature using polynomial fit."""
     if len(points) < degree + 1:
         return 0.0
     try:
+        points = np.asarray(points, dtype=float)
         x = points[:, 0]
         y = points[:, 1]
         coeffs = np.polyfit(x, y, degree)
@@ -87,9 +151,22 @@ def polyfit_curvature(points: np.ndarray, degree: int = 2) -> float:
         return 0.0
 
 
+def _quad_curvature_3pt(x0: float, y0: float, x1: float, y1: float,
+                        x2: float, y2: float, eps: float = 1e-8) -> float:
+    """Curvature proxy |2a| of the parabola y = ax^2 + bx + c through three points."""
+    # Closed form of the exact degree-2 fit; no solution when two x's coincide
+    if abs(x1 - x0) < eps or abs(x2 - x1) < eps or abs(x2 - x0) < eps:
+        return 0.0
+    a = ((y2 - y1) / (x2 - x1) - (y1 - y0) / (x1 - x0)) / (x2 - x0)
+    return abs(2 * a)
+
+
 def create_metric(value: Any, method: str, source_points: List[str], 
                  valid: bool = True, confidence: float = 1.0) -> Dict:
     """Create standardized metric dictionary."""
+    # numpy scalars (float32 in particular) are not JSON serializable
+    if isinstance(value, np.generic):
+        value = value.item()
     return {
         'value': value,
         'method': method,
@@ -99,119 +176,257 @@ def create_metric(value: Any, method: str, source_points: List[str],
     }
 
 
+def _split_landmark_array(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a [..., N, 3] or [..., N, 4] (visibility column) array into float32 points and visibility."""
+    # Always own copies: roll correction rewrites the points in place
+    points = np.array(array[..., :3], dtype=np.float32)
+    if array.shape[-1] == 4:
+        visibility = np.array(array[..., 3], dtype=np.float32)
+    else:
+        visibility = np.ones(array.shape[:-1], dtype=np.float32)
+    return points, visibility
+
+
+def landmarks_to_arrays(landmarks: Union[List[Dict], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert landmark dicts (or an (N, 3)/(N, 4) array) to float32 (N, 3) points and (N,) visibility."""
+    if isinstance(landmarks, np.ndarray):
+        # Fast path for callers that already hold an array; an all-zero
+        # visibility column skips the visibility gate, like missing presence values
+        if landmarks.ndim != 2 or landmarks.shape[-1] not in (3, 4):
+            raise ValueError(f"Expected landmarks of shape (N, 3) or (N, 4), got {landmarks.shape}")
+        return _split_landmark_array(landmarks)
+    
+    count = len(landmarks)
+    try:
+        # Landmarks written by main.py / process_images.py carry all five fields:
+        # read them in one C-level pass (itemgetter + chain), with no Python frame per value
+        fields = itemgetter(*LANDMARK_FIELDS)
+        table = np.fromiter(chain.from_iterable(map(fields, landmarks)),
+                            dtype=np.float32, count=5 * count).reshape(-1, 5)
+    except (KeyError, TypeError):
+        table = None
+    if table is not None:
+        points = table[:, :3].copy()
+        # Use presence if visibility is all zeros (see below)
+        visibility = table[:, 3] if not (table[:, 3] == 0.0).all() else table[:, 4]
+        return points, visibility.copy()
+    
+    # Flat fill, no per-landmark lists; normalized coordinates need nowhere near float64 precision
+    xyz = itemgetter('x', 'y', 'z')
+    points = np.fromiter((c for lm in landmarks for c in xyz(lm)),
+                         dtype=np.float32, count=3 * count).reshape(-1, 3)
+    # MediaPipe often has visibility as 0.0 but presence as high value
+    # Use presence if visibility is all zeros
+    visibility = np.fromiter((lm.get('visibility', 1.0) for lm in landmarks),
+                             dtype=np.float32, count=count)
+    if (visibility == 0.0).all():
+        # Use presence values instead
+        visibility = np.fromiter((lm.get('presence', 1.0) for lm in landmarks),
+                                 dtype=np.float32, count=count)
+    return points, visibility
+
+
 class FaceAnalyzer:
-    def __init__(self, landmarks: List[Dict], blendshapes: Optional[List[Dict]] = None,
-                 index_map: Optional[Dict[str, int]] = None):
+    # Angles measured at a vertex, as (p1, vertex, p2) point names
+    ANGLE_TRIPLES = {
+        'nasolabial': ('nose_tip', 'subnasale', 'labiale_superius'),
+        'mandibular': ('gonion_L', 'menton', 'gonion_R'),
+    }
+    
+    # Bilateral feature pairs compared for symmetry, as (left, right) point names
+    SYMMETRY_PAIRS = (
+        ('L_eye_outer', 'R_eye_outer'),
+        ('L_eye_inner', 'R_eye_inner'),
+        ('L_brow_inner', 'R_brow_inner'),
+        ('L_brow_outer', 'R_brow_outer'),
+        ('alare_L', 'alare_R'),
+        ('cheilion_L', 'cheilion_R'),
+        ('gonion_L', 'gonion_R')
+    )
+    
+    def __init__(self, landmarks: Union[List[Dict], np.ndarray], blendshapes: Optional[List[Dict]] = None,
+                 index_map: Optional[Dict[str, int]] = None, *,
+                 points: Optional[np.ndarray] = None, visibility: Optional[np.ndarray] = None):
         self.landmarks = landmarks
         self.blendshapes = blendshapes or []
         self.index_map = index_map or FALLBACK_INDICES
         self.fallback_indices_used = index_map is None
+        # Custom maps fall back to the default index for any name they leave out
+        self.idx = IDX if index_map is None else SimpleNamespace(**{**FALLBACK_INDICES, **index_map})
         self.visibility_threshold = 0.3
         self.eps = 1e-8
         
-        # Convert landmarks to numpy array
-        self.points = np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
-        # MediaPipe often has visibility as 0.0 but presence as high value
-        # Use presence if visibility is all zeros
-        visibility_values = np.array([lm.get('visibility', 1.0) for lm in landmarks])
-        if (visibility_values == 0.0).all():
-            # Use presence values instead
-            self.visibility = np.array([lm.get('presence', 1.0) for lm in landmarks])
-        else:
-            self.visibility = visibility_values
+        # Convert landmarks unless the caller already did (points are corrected in place).
+        # Pre-converted arrays may also carry a leading frame axis ((F, N, 3) points,
+        # (F, N) visibility); the array stage then runs once for the stack, see frame().
+        if points is None or visibility is None:
+            points, visibility = landmarks_to_arrays(landmarks)
+        self.points = points
+        self.visibility = visibility
+        # The visibility gate is skipped entirely when every value is 0 (per frame)
+        self._skip_vis = (visibility == 0.0).all(axis=-1)
         
         # Apply roll correction
         self._apply_roll_correction()
         
+        # Gather named points and their pairwise distances in one pass
+        self._gather_named_points()
+        self._angles = self._angles_batch(self.ANGLE_TRIPLES)
+        
+        if self.points.ndim == 2:
+            self._bind_frame()
+    
+    def _bind_frame(self):
+        """Resolve the per-face lookups once the array stage covers a single face."""
+        # Resolve every name once (None when missing or below the visibility gate)
+        self._pt_cache = {name: row if ok else None
+                          for name, row, ok in zip(self._named, self._P, self._vis_ok.tolist())}
+        
         # Establish scale basis
         self.scale_basis = self._compute_scale_basis()
         
+        # Raw distances the analyze_* passes record for analyze_golden_diagnostics,
+        # which measures any that are still unset
+        self._d_fissure = {}
+        self._d_eye_width = self._d_intercanthal = self._d_mouth_width = None
+        self._d_face_height = self._d_face_width = None
+    
+    def frame(self, i: int, blendshapes: Optional[List[Dict]] = None) -> 'FaceAnalyzer':
+        """Get the single-face analyzer for frame i of an analyzer built over a frame stack."""
+        face = copy.copy(self)
+        face.blendshapes = blendshapes or []
+        face.points = self.points[i]
+        face.visibility = self.visibility[i]
+        face._skip_vis = self._skip_vis[i]
+        face._P = self._P[i]
+        face._vis_ok = self._vis_ok[i]
+        face._D2 = self._D2[i]
+        face._angles = {key: angles[i] for key, angles in self._angles.items()}
+        face._bind_frame()
+        return face
+    
+    def _in_range(self, idx: int) -> bool:
+        """Check that a landmark index addresses a point in this face."""
+        n = self.points.shape[-2]
+        return -n <= idx < n
+    
     def _apply_roll_correction(self):
         """Align face horizontally using eye line."""
-        try:
-            left_eye = self.points[self.index_map.get('L_eye_outer', 33)]
-            right_eye = self.points[self.index_map.get('R_eye_outer', 263)]
-            
-            # Calculate roll angle
-            dx = right_eye[0] - left_eye[0]
-            dy = right_eye[1] - left_eye[1]
-            roll_angle = np.arctan2(dy, dx)
-            
-            # Rotation matrix for roll correction
-            cos_r = np.cos(-roll_angle)
-            sin_r = np.sin(-roll_angle)
-            rot_matrix = np.array([
-                [cos_r, -sin_r, 0],
-                [sin_r, cos_r, 0],
-                [0, 0, 1]
-            ])
-            
-            # Apply rotation
-            self.points = np.dot(self.points, rot_matrix.T)
-        except:
-            pass  # Keep original if correction fails
+        left_idx = self.idx.L_eye_outer
+        right_idx = self.idx.R_eye_outer
+        if not (self._in_range(left_idx) and self._in_range(right_idx)):
+            return  # Keep original without both eye corners
+        left_eye = self.points[..., left_idx, :]
+        right_eye = self.points[..., right_idx, :]
+        
+        # Calculate roll angle (one per frame)
+        dx = right_eye[..., 0] - left_eye[..., 0]
+        dy = right_eye[..., 1] - left_eye[..., 1]
+        roll_angle = np.arctan2(dy, dx)
+        
+        # Rotate x/y about the z axis in place (z is unchanged)
+        cos_r = np.cos(-roll_angle)[..., None]
+        sin_r = np.sin(-roll_angle)[..., None]
+        x = self.points[..., 0].copy()
+        y = self.points[..., 1]
+        self.points[..., 0] = cos_r * x - sin_r * y
+        self.points[..., 1] = sin_r * x + cos_r * y
     
     def _compute_scale_basis(self) -> float:
         """Compute normalization scale (IPD preferred, face width fallback)."""
-        try:
-            # Try interpupillary distance (outer eye corners for better stability)
-            left_outer = self.points[self.index_map.get('L_eye_outer', 33)]
-            right_outer = self.points[self.index_map.get('R_eye_outer', 263)]
-            eye_width = dist(left_outer, right_outer, '2D')
+        # Try interpupillary distance (outer eye corners for better stability)
+        left_idx = self.idx.L_eye_outer
+        right_idx = self.idx.R_eye_outer
+        if self._in_range(left_idx) and self._in_range(right_idx):
+            eye_width = dist2d(self.points[left_idx], self.points[right_idx])
             if eye_width > self.eps:
                 # This is typically around 0.09-0.12 in normalized coords
                 # Use as reference for face width normalization
-                return eye_width
-        except:
-            pass
+                return float(eye_width)
         
         # Fallback to face width
-        try:
-            left_cheek = self.points[self.index_map.get('L_cheek', 205)]
-            right_cheek = self.points[self.index_map.get('R_cheek', 425)]
-            face_width = dist(left_cheek, right_cheek, '2D')
+        left_idx = self.idx.L_cheek
+        right_idx = self.idx.R_cheek
+        if self._in_range(left_idx) and self._in_range(right_idx):
+            face_width = dist2d(self.points[left_idx], self.points[right_idx])
             if face_width > self.eps:
-                return face_width
-        except:
-            pass
+                return float(face_width)
         
         return 1.0  # Default if all fails
     
-    def _get_point(self, name: str) -> Optional[np.ndarray]:
-        """Get point by name with visibility check."""
-        try:
-            idx = self.index_map.get(name)
-            if idx is None:
-                return None
-            if idx >= len(self.points):
-                return None
-            # Skip visibility check if all visibility values are 0
-            if not (self.visibility == 0.0).all():
-                if self.visibility[idx] < self.visibility_threshold:
-                    return None
-            return self.points[idx]
-        except:
+    def _gather_named_points(self):
+        """Stack the index_map points and compute all their pairwise 2D distances."""
+        n = self.points.shape[-2]
+        if self.index_map is FALLBACK_INDICES:
+            self._named, idx = NAME_POS, NAME_IDX
+        else:
+            self._named = {name: i for i, name in enumerate(self.index_map)}
+            idx = np.array(list(self.index_map.values()), dtype=np.intp)
+        in_range = (idx >= -n) & (idx < n)
+        frames = self.points.shape[:-2]
+        
+        self._P = np.full(frames + (len(idx), 3), np.nan, dtype=np.float32)
+        self._P[..., in_range, :] = self.points[..., idx[in_range], :]
+        
+        # Visibility gate as a mask
+        self._vis_ok = np.broadcast_to(in_range, frames + in_range.shape).copy()
+        self._vis_ok[..., in_range] = (
+            ~(self.visibility[..., idx[in_range]] < self.visibility_threshold)
+            | np.asarray(self._skip_vis)[..., None]
+        )
+        
+        self._D2 = pairwise_dist2d(self._P)
+        self._D2[~(self._vis_ok[..., :, None] & self._vis_ok[..., None, :])] = np.nan
+    
+    def _dist2d(self, a: str, b: str) -> float:
+        """Look up the precomputed 2D distance between two named points."""
+        return self._D2[self._named[a], self._named[b]]
+    
+    def _pair_dist2d(self, pts: NamedPoints, a: str, b: str) -> Optional[float]:
+        """2D distance between two named points, or None unless both pass the gate."""
+        if pts.get(a) is None or pts.get(b) is None:
             return None
+        return self._dist2d(a, b)
+    
+    def _angles_batch(self, triples: Dict[str, Tuple[str, str, str]]) -> Dict[str, float]:
+        """Compute the vertex angle in degrees for every named triple in one pass."""
+        triples = {key: names for key, names in triples.items()
+                   if all(name in self._named for name in names)}
+        if not triples:
+            return {}
+        
+        # Gather all triples at once: shape [..., K, 3 (p1, vertex, p2), 3 (xyz)]
+        # (promoted to float64: arccos is ill-conditioned near 0 and 180 degrees)
+        index = np.array([[self._named[name] for name in names] for names in triples.values()])
+        angles = vertex_angles_deg(self._P[..., index, :].astype(float))
+        return dict(zip(triples, np.moveaxis(angles, -1, 0)))
     
-    def _compute_glabella(self) -> Optional[np.ndarray]:
+    def _compute_glabella(self, pts: Optional[NamedPoints] = None) -> Optional[np.ndarray]:
         """Compute glabella as midpoint between inner brows."""
-        left_brow = self._get_point('L_brow_inner')
-        right_brow = self._get_point('R_brow_inner')
+        pts = self._pt_cache if pts is None else pts
+        left_brow = pts.get('L_brow_inner')
+        right_brow = pts.get('R_brow_inner')
         if left_brow is not None and right_brow is not None:
             return (left_brow + right_brow) / 2
         return None
     
-    def analyze_eyes(self) -> Dict:
+    def analyze_eyes(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Analyze eye-related metrics."""
+        pts = self._pt_cache if pts is None else pts
         eyes = {}
         
+        # Raw widths kept for the facial fifths in analyze_golden_diagnostics
+        self._d_fissure = {}
+        self._d_eye_width = self._d_intercanthal = None
+        
         # Eye measurements
         for side, prefix in [('L', 'left'), ('R', 'right')]:
-            outer = self._get_point(f'{side}_eye_outer')
-            inner = self._get_point(f'{side}_eye_inner')
+            outer = pts.get(f'{side}_eye_outer')
+            inner = pts.get(f'{side}_eye_inner')
             
             if outer is not None and inner is not None:
-                fissure_length = dist(outer, inner, '2D') / self.scale_basis
+                self._d_fissure[side] = self._dist2d(f'{side}_eye_outer', f'{side}_eye_inner')
+                fissure_length = self._d_fissure[side] / self.scale_basis
                 eyes[f'fissure_length_{side}'] = create_metric(
                     fissure_length, '2D', [f'{side}_eye_outer', f'{side}_eye_inner']
                 )
@@ -221,23 +436,24 @@ class FaceAnalyzer:
                 dx = abs(outer[0] - inner[0])  # Use absolute to avoid sign issues
                 if side == 'L':
                     # Left eye: outer is to the left of inner
-                    tilt_deg = np.degrees(np.arctan2(dy, dx))
+                    tilt_deg = math.degrees(math.atan2(dy, dx))
                 else:
                     # Right eye: outer is to the right of inner  
-                    tilt_deg = np.degrees(np.arctan2(dy, dx))
+                    tilt_deg = math.degrees(math.atan2(dy, dx))
                 eyes[f'canthal_tilt_deg_{side}'] = create_metric(
                     tilt_deg, '2D', [f'{side}_eye_outer', f'{side}_eye_inner']
                 )
         
         # Intercanthal distance over eye width
-        left_inner = self._get_point('L_eye_inner')
-        right_inner = self._get_point('R_eye_inner')
-        left_outer = self._get_point('L_eye_outer')
-        right_outer = self._get_point('R_eye_outer')
+        left_inner = pts.get('L_eye_inner')
+        right_inner = pts.get('R_eye_inner')
+        left_outer = pts.get('L_eye_outer')
+        right_outer = pts.get('R_eye_outer')
+        if left_outer is not None and right_outer is not None:
+            self._d_eye_width = self._dist2d('L_eye_outer', 'R_eye_outer')
         if all(p is not None for p in [left_inner, right_inner, left_outer, right_outer]):
-            intercanthal = dist(left_inner, right_inner, '2D')
-            eye_width_total = dist(left_outer, right_outer, '2D')
-            ipd_ratio = safe_ratio(intercanthal, eye_width_total)
+            self._d_intercanthal = self._dist2d('L_eye_inner', 'R_eye_inner')
+            ipd_ratio = safe_ratio(self._d_intercanthal, self._d_eye_width)
             if ipd_ratio is not None:
                 eyes['intercanthal_over_eye_width'] = create_metric(
                     ipd_ratio, '2D', ['L_eye_inner', 'R_eye_inner', 'L_eye_outer', 'R_eye_outer']
@@ -245,9 +461,9 @@ class FaceAnalyzer:
         
         # Brow metrics
         for side in ['L', 'R']:
-            brow_inner = self._get_point(f'{side}_brow_inner')
-            brow_outer = self._get_point(f'{side}_brow_outer')
-            eye_center = self._get_point(f'{side}_eye_inner')
+            brow_inner = pts.get(f'{side}_brow_inner')
+            brow_outer = pts.get(f'{side}_brow_outer')
+            eye_center = pts.get(f'{side}_eye_inner')
             
             if brow_inner is not None and brow_outer is not None and eye_center is not None:
                 # Brow height
@@ -264,24 +480,25 @@ class FaceAnalyzer:
         
         return eyes
     
-    def analyze_nose(self) -> Dict:
+    def analyze_nose(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Analyze nose-related metrics."""
+        pts = self._pt_cache if pts is None else pts
         nose = {}
         
-        nose_tip = self._get_point('nose_tip')
-        subnasale = self._get_point('subnasale')
-        nasion = self._get_point('nasion')
-        alare_l = self._get_point('alare_L')
-        alare_r = self._get_point('alare_R')
+        nose_tip = pts.get('nose_tip')
+        subnasale = pts.get('subnasale')
+        nasion = pts.get('nasion')
+        alare_l = pts.get('alare_L')
+        alare_r = pts.get('alare_R')
         
         # Alar width ratios (compared to inter-eye distance)
         if alare_l is not None and alare_r is not None:
-            alar_width = dist(alare_l, alare_r, '2D')
+            alar_width = self._dist2d('alare_L', 'alare_R')
             # Use eye width as reference for more realistic ratio
-            left_eye_inner = self._get_point('L_eye_inner')
-            right_eye_inner = self._get_point('R_eye_inner')
+            left_eye_inner = pts.get('L_eye_inner')
+            right_eye_inner = pts.get('R_eye_inner')
             if left_eye_inner is not None and right_eye_inner is not None:
-                inter_eye = dist(left_eye_inner, right_eye_inner, '2D')
+                inter_eye = self._dist2d('L_eye_inner', 'R_eye_inner')
                 nose['alar_width_over_inter_eye'] = create_metric(
                     safe_ratio(alar_width, inter_eye), '2D', ['alare_L', 'alare_R', 'L_eye_inner', 'R_eye_inner']
                 )
@@ -292,10 +509,10 @@ class FaceAnalyzer:
         
         # Nasal length
         if nasion is not None and subnasale is not None:
-            nasal_length = dist(nasion, subnasale, '2D')
-            chin_tip = self._get_point('chin_tip')
+            nasal_length = self._dist2d('nasion', 'subnasale')
+            chin_tip = pts.get('chin_tip')
             if chin_tip is not None:
-                face_height = dist(nasion, chin_tip, '2D')
+                face_height = self._dist2d('nasion', 'chin_tip')
                 ratio = safe_ratio(nasal_length, face_height)
                 if ratio is not None:
                     nose['nasal_length_over_face_height'] = create_metric(
@@ -311,44 +528,49 @@ class FaceAnalyzer:
         
         # Nasolabial angle
         if nose_tip is not None and subnasale is not None:
-            upper_lip = self._get_point('labiale_superius')
+            upper_lip = pts.get('labiale_superius')
             if upper_lip is not None:
-                angle = angle_deg(nose_tip, subnasale, upper_lip)
+                angle = self._angles['nasolabial']
                 nose['nasal_tip_to_upper_lip_angle_deg'] = create_metric(
                     angle, '2D', ['nose_tip', 'subnasale', 'labiale_superius']
                 )
         
         return nose
     
-    def analyze_mouth(self) -> Dict:
+    def analyze_mouth(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Analyze mouth-related metrics."""
+        pts = self._pt_cache if pts is None else pts
         mouth = {}
         
-        left_corner = self._get_point('cheilion_L')
-        right_corner = self._get_point('cheilion_R')
-        upper_lip = self._get_point('labiale_superius')
-        lower_lip = self._get_point('labiale_inferius')
-        stomion = self._get_point('stomion')
+        left_corner = pts.get('cheilion_L')
+        right_corner = pts.get('cheilion_R')
+        upper_lip = pts.get('labiale_superius')
+        lower_lip = pts.get('labiale_inferius')
+        stomion = pts.get('stomion')
         
         # Mouth width
+        self._d_mouth_width = None
         if left_corner is not None and right_corner is not None:
-            mouth_width = dist(left_corner, right_corner, '2D')
+            self._d_mouth_width = mouth_width = self._dist2d('cheilion_L', 'cheilion_R')
             mouth['mouth_width_over_IPD'] = create_metric(
                 mouth_width / self.scale_basis, '2D', ['cheilion_L', 'cheilion_R']
             )
             
             # Smile arc curvature
             if stomion is not None:
-                arc_points = np.array([left_corner[:2], stomion[:2], right_corner[:2]])
-                curvature = polyfit_curvature(arc_points)
+                curvature = _quad_curvature_3pt(
+                    float(left_corner[0]), float(left_corner[1]),
+                    float(stomion[0]), float(stomion[1]),
+                    float(right_corner[0]), float(right_corner[1])
+                )
                 mouth['smile_arc_curvature'] = create_metric(
                     curvature, '2D', ['cheilion_L', 'stomion', 'cheilion_R']
                 )
         
         # Lip thickness
         if upper_lip is not None and lower_lip is not None and stomion is not None:
-            upper_thickness = dist(upper_lip, stomion, '2D')
-            lower_thickness = dist(stomion, lower_lip, '2D')
+            upper_thickness = self._dist2d('labiale_superius', 'stomion')
+            lower_thickness = self._dist2d('stomion', 'labiale_inferius')
             ratio = safe_ratio(upper_thickness, lower_thickness)
             if ratio is not None:
                 mouth['upper_to_lower_lip_ratio'] = create_metric(
@@ -364,21 +586,22 @@ class FaceAnalyzer:
         
         return mouth
     
-    def analyze_structure(self) -> Dict:
+    def analyze_structure(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Analyze facial structure and proportions."""
+        pts = self._pt_cache if pts is None else pts
         structure = {}
         
-        chin_tip = self._get_point('chin_tip')
-        nasion = self._get_point('nasion')
-        glabella = self._compute_glabella()
-        subnasale = self._get_point('subnasale')
-        stomion = self._get_point('stomion')
+        chin_tip = pts.get('chin_tip')
+        nasion = pts.get('nasion')
+        glabella = self._compute_glabella(pts)
+        subnasale = pts.get('subnasale')
+        stomion = pts.get('stomion')
         
         # Facial thirds
         if glabella is not None and subnasale is not None and chin_tip is not None:
-            upper_third = dist(glabella, nasion, '2D') if nasion is not None else 0
-            middle_third = dist(nasion, subnasale, '2D') if nasion is not None else 0
-            lower_third = dist(subnasale, chin_tip, '2D')
+            upper_third = dist2d(glabella, nasion) if nasion is not None else 0
+            middle_third = self._dist2d('nasion', 'subnasale') if nasion is not None else 0
+            lower_third = self._dist2d('subnasale', 'chin_tip')
             
             if middle_third > self.eps:
                 structure['upper_to_middle_third'] = create_metric(
@@ -391,12 +614,13 @@ class FaceAnalyzer:
                 )
         
         # Face height over width
+        self._d_face_height = self._d_face_width = None
         if chin_tip is not None and nasion is not None:
-            face_height = dist(nasion, chin_tip, '2D')
-            left_cheek = self._get_point('L_cheek')
-            right_cheek = self._get_point('R_cheek')
+            self._d_face_height = face_height = self._dist2d('nasion', 'chin_tip')
+            left_cheek = pts.get('L_cheek')
+            right_cheek = pts.get('R_cheek')
             if left_cheek is not None and right_cheek is not None:
-                face_width = dist(left_cheek, right_cheek, '2D')
+                self._d_face_width = face_width = self._dist2d('L_cheek', 'R_cheek')
                 ratio = safe_ratio(face_height, face_width)
                 if ratio is not None:
                     structure['face_height_over_width'] = create_metric(
@@ -404,19 +628,19 @@ class FaceAnalyzer:
                     )
         
         # Jaw metrics
-        gonion_l = self._get_point('gonion_L')
-        gonion_r = self._get_point('gonion_R')
-        menton = self._get_point('menton')
+        gonion_l = pts.get('gonion_L')
+        gonion_r = pts.get('gonion_R')
+        menton = pts.get('menton')
         
         if gonion_l is not None and gonion_r is not None:
-            gonial_width = dist(gonion_l, gonion_r, '2D') / self.scale_basis
+            gonial_width = self._dist2d('gonion_L', 'gonion_R') / self.scale_basis
             structure['gonial_width_normalized'] = create_metric(
                 gonial_width, '2D', ['gonion_L', 'gonion_R']
             )
             
             if menton is not None:
                 # Mandibular angle
-                angle = angle_deg(gonion_l, menton, gonion_r)
+                angle = self._angles['mandibular']
                 structure['mandibular_angle_deg'] = create_metric(
                     angle, '2D', ['gonion_L', 'menton', 'gonion_R']
                 )
@@ -434,59 +658,48 @@ class FaceAnalyzer:
         """Analyze facial symmetry."""
         symmetry = {}
         
-        # Collect paired features
-        pairs = [
-            ('L_eye_outer', 'R_eye_outer'),
-            ('L_eye_inner', 'R_eye_inner'),
-            ('L_brow_inner', 'R_brow_inner'),
-            ('L_brow_outer', 'R_brow_outer'),
-            ('alare_L', 'alare_R'),
-            ('cheilion_L', 'cheilion_R'),
-            ('gonion_L', 'gonion_R')
-        ]
-        
-        midline_deviations = []
-        bilateral_deltas = {}
-        
-        for left_name, right_name in pairs:
-            left_pt = self._get_point(left_name)
-            right_pt = self._get_point(right_name)
-            
-            if left_pt is not None and right_pt is not None:
-                # Midline deviation (should be close to 0 for perfect symmetry)
-                midpoint = (left_pt + right_pt) / 2
-                # Deviation from center (x=0.5 in normalized coords)
-                midline_dev = abs(midpoint[0] - 0.5) / self.scale_basis
-                midline_deviations.append(midline_dev)
-                
-                # Bilateral asymmetry
-                left_dist = abs(left_pt[0])
-                right_dist = abs(right_pt[0])
-                delta = abs(left_dist - right_dist) / self.scale_basis
-                bilateral_deltas[f'{left_name}_vs_{right_name}'] = delta
+        # Gather all paired features at once; a pair counts only if both sides pass the gate
+        pairs = [(left, right) for left, right in self.SYMMETRY_PAIRS
+                 if left in self._named and right in self._named]
+        left_idx = [self._named[left] for left, _ in pairs]
+        right_idx = [self._named[right] for _, right in pairs]
+        valid = self._vis_ok[left_idx] & self._vis_ok[right_idx]
+        left_x = self._P[left_idx, 0][valid]
+        right_x = self._P[right_idx, 0][valid]
+        
+        # Midline deviation from center (x=0.5 in normalized coords), 0 for perfect symmetry
+        midline_deviations = np.abs((left_x + right_x) / 2 - 0.5) / self.scale_basis
+        
+        # Bilateral asymmetry
+        deltas = np.abs(np.abs(left_x) - np.abs(right_x)) / self.scale_basis
+        bilateral_deltas = {
+            f'{left}_vs_{right}': delta
+            for (left, right), delta in zip(compress(pairs, valid), deltas.tolist())
+        }
         
-        if midline_deviations:
+        if midline_deviations.size:
             # Clamp the score between 0 and 1
             avg_deviation = np.mean(midline_deviations)
             # Normalize: small deviations = high score
             score = max(0.0, min(1.0, 1.0 - (avg_deviation / 5.0)))  # Scale factor of 5
             symmetry['midline_symmetry_score'] = create_metric(
                 score, '2D',
-                [p[0] for p in pairs] + [p[1] for p in pairs]
+                [p[0] for p in self.SYMMETRY_PAIRS] + [p[1] for p in self.SYMMETRY_PAIRS]
             )
         
         symmetry['bilateral_feature_deltas'] = bilateral_deltas
         
         return symmetry
     
-    def analyze_profile(self) -> Dict:
+    def analyze_profile(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Analyze profile metrics (3D)."""
+        pts = self._pt_cache if pts is None else pts
         profile = {}
         
-        nose_tip = self._get_point('nose_tip')
-        chin_tip = self._get_point('chin_tip')
-        upper_lip = self._get_point('labiale_superius')
-        lower_lip = self._get_point('labiale_inferius')
+        nose_tip = pts.get('nose_tip')
+        chin_tip = pts.get('chin_tip')
+        upper_lip = pts.get('labiale_superius')
+        lower_lip = pts.get('labiale_inferius')
         
         if nose_tip is not None and chin_tip is not None:
             # E-line (Ricketts' esthetic plane)
@@ -515,11 +728,11 @@ class FaceAnalyzer:
                 )
         
         # Midface depth
-        left_cheek = self._get_point('L_cheek')
-        right_cheek = self._get_point('R_cheek')
+        left_cheek = pts.get('L_cheek')
+        right_cheek = pts.get('R_cheek')
         if left_cheek is not None and right_cheek is not None:
             midface_depth = (abs(left_cheek[2]) + abs(right_cheek[2])) / 2
-            face_width = dist(left_cheek, right_cheek, '2D')
+            face_width = self._dist2d('L_cheek', 'R_cheek')
             ratio = safe_ratio(midface_depth, face_width)
             if ratio is not None:
                 profile['midface_depth_over_face_width'] = create_metric(
@@ -528,46 +741,49 @@ class FaceAnalyzer:
         
         return profile
     
-    def analyze_golden_diagnostics(self) -> Dict:
+    def analyze_golden_diagnostics(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Compute golden ratio diagnostic metrics."""
+        pts = self._pt_cache if pts is None else pts
         golden = {}
         
+        # Reuse the widths measured by the other passes, measuring any they have not
+        # (when this is called on its own)
+        eye_width = self._d_eye_width
+        if eye_width is None:
+            eye_width = self._pair_dist2d(pts, 'L_eye_outer', 'R_eye_outer')
+        mouth_width = self._d_mouth_width
+        if mouth_width is None:
+            mouth_width = self._pair_dist2d(pts, 'cheilion_L', 'cheilion_R')
+        face_height = self._d_face_height
+        if face_height is None:
+            face_height = self._pair_dist2d(pts, 'nasion', 'chin_tip')
+        face_width = self._d_face_width
+        if face_width is None:
+            face_width = self._pair_dist2d(pts, 'L_cheek', 'R_cheek')
+        
         # Collect various ratios
         ratios_to_check = []
         
         # Eye to mouth width
-        left_eye_outer = self._get_point('L_eye_outer')
-        right_eye_outer = self._get_point('R_eye_outer')
-        left_mouth = self._get_point('cheilion_L')
-        right_mouth = self._get_point('cheilion_R')
-        
-        if all(p is not None for p in [left_eye_outer, right_eye_outer, left_mouth, right_mouth]):
-            eye_width = dist(left_eye_outer, right_eye_outer, '2D')
-            mouth_width = dist(left_mouth, right_mouth, '2D')
+        if eye_width is not None and mouth_width is not None:
             ratio = safe_ratio(eye_width, mouth_width)
             if ratio is not None:
                 ratios_to_check.append(('eye_to_mouth_width', ratio))
         
         # Face height to width
-        chin_tip = self._get_point('chin_tip')
-        nasion = self._get_point('nasion')
-        left_cheek = self._get_point('L_cheek')
-        right_cheek = self._get_point('R_cheek')
-        
-        if all(p is not None for p in [chin_tip, nasion, left_cheek, right_cheek]):
-            face_height = dist(nasion, chin_tip, '2D')
-            face_width = dist(left_cheek, right_cheek, '2D')
+        if face_height is not None and face_width is not None:
             ratio = safe_ratio(face_height, face_width)
             if ratio is not None:
                 ratios_to_check.append(('face_height_to_width', ratio))
         
         # Nose to mouth height
-        subnasale = self._get_point('subnasale')
-        stomion = self._get_point('stomion')
+        chin_tip = pts.get('chin_tip')
+        subnasale = pts.get('subnasale')
+        stomion = pts.get('stomion')
         
         if subnasale is not None and stomion is not None and chin_tip is not None:
-            nose_to_mouth = dist(subnasale, stomion, '2D')
-            mouth_to_chin = dist(stomion, chin_tip, '2D')
+            nose_to_mouth = self._dist2d('subnasale', 'stomion')
+            mouth_to_chin = self._dist2d('stomion', 'chin_tip')
             ratio = safe_ratio(nose_to_mouth, mouth_to_chin)
             if ratio is not None:
                 ratios_to_check.append(('nose_mouth_to_mouth_chin', ratio))
@@ -583,11 +799,14 @@ class FaceAnalyzer:
         golden['phi_deviations'] = phi_deviations
         
         # Facial thirds evenness
+        structure = getattr(self, 'structure', None)
+        if structure is None:
+            structure = self.analyze_structure(pts)
         thirds_ratios = []
-        if 'upper_to_middle_third' in self.structure:
-            thirds_ratios.append(self.structure['upper_to_middle_third'].get('value', 1.0))
-        if 'lower_to_middle_third' in self.structure:
-            thirds_ratios.append(self.structure['lower_to_middle_third'].get('value', 1.0))
+        if 'upper_to_middle_third' in structure:
+            thirds_ratios.append(structure['upper_to_middle_third'].get('value', 1.0))
+        if 'lower_to_middle_third' in structure:
+            thirds_ratios.append(structure['lower_to_middle_third'].get('value', 1.0))
         
         if thirds_ratios:
             evenness = 1.0 - np.std(thirds_ratios)
@@ -595,18 +814,20 @@ class FaceAnalyzer:
                 evenness, '2D', [], valid=True, confidence=0.7
             )
         
-        # Facial fifths analysis
-        left_outer = self._get_point('L_eye_outer')
-        left_inner = self._get_point('L_eye_inner')
-        right_inner = self._get_point('R_eye_inner')
-        right_outer = self._get_point('R_eye_outer')
-        
-        if all(p is not None for p in [left_outer, left_inner, right_inner, right_outer]):
+        # Facial fifths analysis (all four eye corners passed the gate)
+        eye_width_l = self._d_fissure.get('L')
+        if eye_width_l is None:
+            eye_width_l = self._pair_dist2d(pts, 'L_eye_outer', 'L_eye_inner')
+        eye_width_r = self._d_fissure.get('R')
+        if eye_width_r is None:
+            eye_width_r = self._pair_dist2d(pts, 'R_eye_outer', 'R_eye_inner')
+        intercanthal = self._d_intercanthal
+        if intercanthal is None:
+            intercanthal = self._pair_dist2d(pts, 'L_eye_inner', 'R_eye_inner')
+        
+        if all(d is not None for d in (eye_width, eye_width_l, eye_width_r, intercanthal)):
             # Approximate facial fifths
-            total_width = dist(left_outer, right_outer, '2D')
-            eye_width_l = dist(left_outer, left_inner, '2D')
-            eye_width_r = dist(right_inner, right_outer, '2D')
-            intercanthal = dist(left_inner, right_inner, '2D')
+            total_width = eye_width
             
             fifths = [eye_width_l, intercanthal, eye_width_r]
             ideal_fifth = total_width / 5
@@ -640,18 +861,19 @@ class FaceAnalyzer:
     
     def analyze(self) -> Dict:
         """Main analysis function."""
-        # Analyze all components
-        self.eyes = self.analyze_eyes()
-        self.nose = self.analyze_nose()
-        self.mouth = self.analyze_mouth()
-        self.structure = self.analyze_structure()
+        # Analyze all components over one shared set of resolved points
+        pts = self._pt_cache
+        self.eyes = self.analyze_eyes(pts)
+        self.nose = self.analyze_nose(pts)
+        self.mouth = self.analyze_mouth(pts)
+        self.structure = self.analyze_structure(pts)
         self.symmetry = self.analyze_symmetry()
-        self.profile = self.analyze_profile()
-        self.golden = self.analyze_golden_diagnostics()
+        self.profile = self.analyze_profile(pts)
+        self.golden = self.analyze_golden_diagnostics(pts)
         self.blendshape_summary = self.analyze_blendshapes()
         
         # Estimate pose
-        pose = self._estimate_pose()
+        pose = self._estimate_pose(pts)
         
         # Compile results
         return {
@@ -671,53 +893,69 @@ class FaceAnalyzer:
             'blendshape_summary': self.blendshape_summary
         }
     
-    def _estimate_pose(self) -> Dict:
+    def _estimate_pose(self, pts: Optional[NamedPoints] = None) -> Dict:
         """Estimate head pose (roll, yaw, pitch)."""
-        try:
-            # Simplified pose estimation using key points
-            nose_tip = self._get_point('nose_tip')
-            chin_tip = self._get_point('chin_tip')
-            left_ear = self._get_point('L_ear_top')
-            right_ear = self._get_point('R_ear_top')
-            
-            pose = {}
-            
-            # Roll (already corrected, should be near 0)
-            if left_ear is not None and right_ear is not None:
-                roll = np.degrees(np.arctan2(
-                    right_ear[1] - left_ear[1],
-                    right_ear[0] - left_ear[0]
-                ))
-                pose['roll_deg'] = roll
-            
-            # Yaw (left-right rotation)
-            if nose_tip is not None:
-                # Use nose tip x-position as proxy
-                yaw = np.degrees(np.arcsin(np.clip(nose_tip[0] * 2, -1, 1)))
-                pose['yaw_deg'] = yaw
-            
-            # Pitch (up-down rotation)
-            if nose_tip is not None and chin_tip is not None:
-                # Use vertical angle between nose and chin
-                pitch = np.degrees(np.arctan2(
-                    chin_tip[1] - nose_tip[1],
-                    abs(chin_tip[2] - nose_tip[2]) + self.eps
-                ))
-                pose['pitch_deg'] = pitch
-            
-            return pose
-        except:
-            return {}
+        pts = self._pt_cache if pts is None else pts
+        # Simplified pose estimation using key points
+        nose_tip = pts.get('nose_tip')
+        chin_tip = pts.get('chin_tip')
+        left_ear = pts.get('L_ear_top')
+        right_ear = pts.get('R_ear_top')
+        
+        pose = {}
+        
+        # Roll (already corrected, should be near 0)
+        if left_ear is not None and right_ear is not None:
+            roll = math.degrees(math.atan2(
+                right_ear[1] - left_ear[1],
+                right_ear[0] - left_ear[0]
+            ))
+            pose['roll_deg'] = roll
+        
+        # Yaw (left-right rotation)
+        if nose_tip is not None:
+            # Use nose tip x-position as proxy
+            # (clamped max-then-min so a NaN coordinate stays NaN)
+            yaw = math.degrees(math.asin(min(max(float(nose_tip[0]) * 2, -1.0), 1.0)))
+            pose['yaw_deg'] = yaw
+        
+        # Pitch (up-down rotation)
+        if nose_tip is not None and chin_tip is not None:
+            # Use vertical angle between nose and chin
+            pitch = math.degrees(math.atan2(
+                chin_tip[1] - nose_tip[1],
+                abs(chin_tip[2] - nose_tip[2]) + self.eps
+            ))
+            pose['pitch_deg'] = pitch
+        
+        return pose
+
 
+def _result_cache_key(points: np.ndarray, visibility: np.ndarray,
+                      blendshapes: Optional[List[Dict]],
+                      index_map: Optional[Dict[str, int]]) -> Tuple:
+    """Build a hashable key from everything analyze_face_ratios depends on."""
+    return (
+        points.tobytes(),
+        visibility.tobytes(),
+        tuple((bs.get('category_name', 'unknown'), bs.get('score', 0)) for bs in blendshapes or ()),
+        tuple(index_map.items()) if index_map is not None else None
+    )
 
-def analyze_face_ratios(landmarks: List[Dict], 
+
+def analyze_face_ratios(landmarks: Union[List[Dict], np.ndarray], 
                         blendshapes: Optional[List[Dict]] = None,
                         index_map: Optional[Dict[str, int]] = None) -> Dict:
     """
     Main entry point for facial ratio analysis.
     
+    Results for the last RESULT_CACHE_SIZE distinct inputs are memoized, so
+    re-analyzing an unchanged frame costs one array conversion and a copy. Each
+    call returns its own deep copy, so callers may modify the result freely.
+    
     Args:
-        landmarks: List of landmark dictionaries with x, y, z, visibility, presence
+        landmarks: List of landmark dictionaries with x, y, z, visibility, presence,
+            or an array of shape (N, 3) / (N, 4) with a visibility column appended
         blendshapes: Optional list of blendshape dictionaries
         index_map: Optional custom index mapping
     
@@ -725,8 +963,20 @@ def analyze_face_ratios(landmarks: List[Dict],
         Dictionary with computed metrics
     """
     try:
-        analyzer = FaceAnalyzer(landmarks, blendshapes, index_map)
-        return analyzer.analyze()
+        points, visibility = landmarks_to_arrays(landmarks)
+        key = _result_cache_key(points, visibility, blendshapes, index_map)
+        result = _result_cache.get(key)
+        if result is not None:
+            _result_cache.move_to_end(key)
+        else:
+            analyzer = FaceAnalyzer(landmarks, blendshapes, index_map,
+                                    points=points, visibility=visibility)
+            result = analyzer.analyze()
+            _result_cache[key] = result
+            if len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+        # Deep copy, so no caller can alter the cached result or another caller's
+        return copy.deepcopy(result)
     except Exception as e:
         import traceback
         return {
@@ -736,22 +986,124 @@ def analyze_face_ratios(landmarks: List[Dict],
         }
 
 
+def analyze_face_ratios_batch(landmarks_batch: np.ndarray,
+                              blendshapes_batch: Optional[List[Optional[List[Dict]]]] = None,
+                              index_map: Optional[Dict[str, int]] = None) -> List[Dict]:
+    """
+    Batched entry point for many frames (video, dataset preprocessing).
+    
+    Roll correction, named point gathering, pairwise distances and angles run
+    once over the whole stack; only the per-frame metric dictionaries are built
+    frame by frame.
+    
+    Args:
+        landmarks_batch: Array of shape (F, N, 3) with x, y, z per landmark, or
+            (F, N, 4) with a visibility column appended
+        blendshapes_batch: Optional list of F blendshape lists (or None entries)
+        index_map: Optional custom index mapping shared by all frames
+    
+    Returns:
+        List of F dictionaries, as analyze_face_ratios would return per frame
+    """
+    batch = np.asarray(landmarks_batch)
+    if batch.ndim != 3 or batch.shape[-1] not in (3, 4):
+        raise ValueError(f"Expected landmarks of shape (F, N, 3) or (F, N, 4), got {batch.shape}")
+    
+    points, visibility = _split_landmark_array(batch)
+    
+    stack = FaceAnalyzer(None, None, index_map, points=points, visibility=visibility)
+    results = []
+    for i in range(len(batch)):
+        blendshapes = blendshapes_batch[i] if blendshapes_batch is not None else None
+        try:
+            results.append(stack.frame(i, blendshapes).analyze())
+        except Exception as e:
+            import traceback
+            results.append({
+                'error': str(e),
+                'traceback': traceback.format_exc(),
+                'status': 'failed'
+            })
+    return results
+
+
+def _sidecar_path(landmark_path: Path) -> Path:
+    return landmark_path.with_name(landmark_path.name + SIDECAR_SUFFIX)
+
+
+def save_landmark_sidecar(landmark_path: str, data: Dict) -> None:
+    """
+    Write the first face of a .landmark payload to a binary sidecar next to it.
+    
+    process_landmark_file loads the sidecar instead of parsing the JSON. Payloads
+    the arrays cannot carry exactly (missing fields, unnamed blendshapes) are
+    left JSON-only.
+    
+    Args:
+        landmark_path: Path of the .landmark JSON file written from data
+        data: The .landmark payload (face_landmarks, face_blendshapes)
+    """
+    faces = data.get('face_landmarks')
+    if not faces or not faces[0]:
+        return
+    landmarks = faces[0]
+    blendshapes = (data.get('face_blendshapes') or [None])[0] or []
+    try:
+        table = np.fromiter(chain.from_iterable(map(itemgetter(*LANDMARK_FIELDS), landmarks)),
+                            dtype=np.float32, count=len(LANDMARK_FIELDS) * len(landmarks))
+        names = [bs['category_name'] for bs in blendshapes]
+        scores = np.array([bs['score'] for bs in blendshapes], dtype=np.float64)
+    except (KeyError, TypeError):
+        return
+    if not all(isinstance(name, str) for name in names):
+        return
+    
+    np.savez(_sidecar_path(Path(landmark_path)),
+             landmarks=table.reshape(-1, len(LANDMARK_FIELDS)),
+             blendshape_names=np.array(names, dtype=str),
+             blendshape_scores=scores)
+
+
+def _load_landmark_sidecar(landmark_path: Path) -> Optional[Tuple[np.ndarray, List[Dict]]]:
+    """Load (landmarks, blendshapes) from a .landmark file's sidecar, or None if it has none that is current."""
+    sidecar = _sidecar_path(landmark_path)
+    try:
+        # A JSON file rewritten after its sidecar wins
+        if sidecar.stat().st_mtime_ns < landmark_path.stat().st_mtime_ns:
+            return None
+        with np.load(sidecar) as arrays:
+            table = arrays['landmarks']
+            names = arrays['blendshape_names'].tolist()
+            scores = arrays['blendshape_scores'].tolist()
+    except (OSError, KeyError, ValueError):
+        return None
+    
+    # Resolve visibility as landmarks_to_arrays does for dicts, presence standing in for all-zero visibility
+    visibility = table[:, 3] if not (table[:, 3] == 0.0).all() else table[:, 4]
+    landmarks = np.column_stack([table[:, :3], visibility])
+    blendshapes = [{'category_name': name, 'score': score} for name, score in zip(names, scores)]
+    return landmarks, blendshapes
+
+
 def process_landmark_file(filepath: str) -> Dict:
-    """Process a single .landmark file."""
+    """Process a single .landmark file (from its binary sidecar when one is current)."""
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        # Extract landmarks (handle nested structure)
-        if 'face_landmarks' in data:
-            landmarks = data['face_landmarks'][0] if data['face_landmarks'] else []
+        sidecar = _load_landmark_sidecar(Path(filepath))
+        if sidecar is not None:
+            landmarks, blendshapes = sidecar
         else:
-            landmarks = data.get('landmarks', [])
-        
-        # Extract blendshapes if available
-        blendshapes = None
-        if 'face_blendshapes' in data:
-            blendshapes = data['face_blendshapes'][0] if data['face_blendshapes'] else None
+            data = load_json(filepath)
+            
+            # Extract landmarks (handle nested structure)
+            if 'face_landmarks' in data:
+                landmarks = data['face_landmarks'][0] if data['face_landmarks'] else []
+            else:
+                landmarks = data.get('landmarks', [])
+            
+            # Extract blendshapes if available
+            blendshapes = None
+            if 'face_blendshapes' in data:
+                blendshapes = data['face_blendshapes'][0] if data['face_blendshapes'] else None
         
         # Perform analysis
         result = analyze_face_ratios(landmarks, blendshapes)
@@ -766,8 +1118,15 @@ def process_landmark_file(filepath: str) -> Dict:
         }
 
 
-def process_landmarks_directory(directory: str = 'landmarks') -> None:
-    """Process all .landmark files in a directory."""
+def analyze_landmark_file(filepath: Path) -> Dict:
+    """Process one .landmark file and write the result beside it as .golden.json."""
+    result = process_landmark_file(str(filepath))
+    filepath.with_suffix('.golden.json').write_bytes(dumps_json(result, compact=True))
+    return result
+
+
+def process_landmarks_directory(directory: str = 'landmarks', jobs: Optional[int] = None) -> None:
+    """Process all .landmark files in a directory, using up to jobs processes (default: one per CPU)."""
     landmark_dir = Path(directory)
     
     if not landmark_dir.exists():
@@ -782,50 +1141,62 @@ def process_landmarks_directory(directory: str = 'landmarks') -> None:
     
     print(f"Found {len(landmark_files)} landmark files")
     
-    results = []
-    for filepath in landmark_files:
-        print(f"Processing {filepath.name}...")
-        result = process_landmark_file(str(filepath))
-        results.append(result)
-        
-        # Save individual result
-        output_path = filepath.with_suffix('.golden.json')
-        with open(output_path, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        if 'error' not in result:
-            print(f"  ✓ Saved analysis to {output_path.name}")
-        else:
-            print(f"  ✗ Error: {result['error']}")
-    
-    # Save summary
+    # Files are independent, so analyze (and save) them across processes; map
+    # keeps the input order, so the progress lines and summary read as for a serial run
+    workers = worker_count(jobs, os.cpu_count() or 1, len(landmark_files))
     summary_path = landmark_dir / 'golden_analysis_summary.json'
-    with open(summary_path, 'w') as f:
-        json.dump({
-            'total_files': len(results),
-            'successful': sum(1 for r in results if 'error' not in r),
-            'failed': sum(1 for r in results if 'error' in r),
-            'results': results
-        }, f, indent=2)
+    successful = failed = 0
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        if executor is not None:
+            results = executor.map(analyze_landmark_file, landmark_files, chunksize=MAP_CHUNKSIZE)
+        else:
+            results = map(analyze_landmark_file, landmark_files)
+        
+        # Stream each result into the summary as it arrives rather than holding
+        # every analysis for one dump at the end; only the counts are kept. The
+        # stream goes to a temporary file that replaces the summary only once
+        # it is complete, so a failed run never leaves a truncated summary
+        partial_path = summary_path.with_name(summary_path.name + '.tmp')
+        try:
+            with open(partial_path, 'wb') as summary:
+                summary.write(b'{"results":[')
+                for filepath, result in zip(landmark_files, results):
+                    print(f"Processing {filepath.name}...")
+                    if 'error' not in result:
+                        successful += 1
+                        print(f"  ✓ Saved analysis to {filepath.with_suffix('.golden.json').name}")
+                    else:
+                        failed += 1
+                        print(f"  ✗ Error: {result['error']}")
+                    
+                    if successful + failed > 1:
+                        summary.write(b',')
+                    summary.write(dumps_json(result, compact=True))
+                
+                summary.write(f'],"total_files":{successful + failed},'
+                              f'"successful":{successful},"failed":{failed}}}'.encode())
+            os.replace(partial_path, summary_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
     
     print(f"\nSummary saved to {summary_path}")
-    print(f"Successfully processed {sum(1 for r in results if 'error' not in r)}/{len(results)} files")
+    print(f"Successfully processed {successful}/{successful + failed} files")
 
 
 if __name__ == '__main__':
     # Test with synthetic data
     print("Testing with synthetic face landmarks...")
     
-    # Create synthetic test landmarks (simplified face)
-    test_landmarks = []
-    for i in range(468):
-        test_landmarks.append({
-            'x': 0.5 + 0.1 * np.sin(i * 0.1),
-            'y': 0.5 + 0.1 * np.cos(i * 0.1),
-            'z': 0.01 * np.sin(i * 0.05),
-            'visibility': 0.99,
-            'presence': 0.99
-        })
+    # Create synthetic test landmarks (simplified face) as one (468, 4)
+    # x, y, z, visibility array, which analyze_face_ratios takes directly
+    i = np.arange(468)
+    test_landmarks = np.column_stack([
+        0.5 + 0.1 * np.sin(i * 0.1),
+        0.5 + 0.1 * np.cos(i * 0.1),
+        0.01 * np.sin(i * 0.05),
+        np.full(468, 0.99)
+    ])
     
     # Run analysis
     result = analyze_face_ratios(test_landmarks)
@@ -847,13 +1218,21 @@ if __name__ == '__main__':
         # Automatically run golden.final.py for human-friendly interpretations
         print("\n" + "="*50)
         print("Generating human-friendly interpretations...")
-        import subprocess
+        import importlib.util
         import sys
+        # Loaded in this process rather than run as a second interpreter
+        spec = importlib.util.spec_from_file_location("golden_final", "golden.final.py")
+        golden_final = importlib.util.module_from_spec(spec)
+        # Registered so its worker processes can find the module's functions
+        sys.modules[spec.name] = golden_final
         try:
-            subprocess.run([sys.executable, 'golden.final.py', 'landmarks'], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running golden.final.py: {e}")
+            spec.loader.exec_module(golden_final)
         except FileNotFoundError:
             print("golden.final.py not found in current directory")
+        else:
+            try:
+                golden_final.process_all_golden_files('landmarks')
+            except Exception as e:
+                print(f"Error running golden.final.py: {e}")
     else:
         print("\nNo 'landmarks' directory found. Create it and add .landmark files to process.")
\ No newline at end of file
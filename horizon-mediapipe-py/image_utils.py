@@ -0,0 +1,179 @@
+"""
+Image helpers shared by the face detection scripts: decoding ahead of the
+detector, MediaPipe conversion, detection rescaling and JPEG header checks.
+"""
+
+import os
+import struct
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+import cv2
+import numpy as np
+import mediapipe as mp
+
+from common import list_by_suffix
+
+
+PREFETCH_DEPTH = 4  # decoded images allowed to wait for the detector
+JPEG_QUALITY = 85  # face crops look the same as at OpenCV's default 95, and are smaller
+DETECTION_DECODE = cv2.IMREAD_REDUCED_COLOR_2  # JPEG decoded at half scale for detection
+DETECTION_MAX_DIM = 512  # longest side fed to the detector; BlazeFace works at ~128-320px
+RGB_BUFFER_SHAPES = 4  # distinct image shapes kept with a reusable RGB buffer
+MIN_SHORT_EDGE = 96  # pixels; smaller images cannot give a usable face crop
+MAX_ASPECT_RATIO = 4.0  # longer than this (banners, strips) is not a photo of a face
+
+# Conversion buffers for to_mp_image, keyed by image shape
+_rgb_buffers = {}
+
+
+def read_image(path: Path) -> Optional[np.ndarray]:
+    """Decode an image as BGR at full resolution (None if it cannot be read)."""
+    return cv2.imread(str(path))
+
+
+def read_detection_image(path: Path) -> Optional[np.ndarray]:
+    """Decode an image as BGR for detection, JPEGs at half scale (None if it cannot be read)."""
+    return cv2.imread(str(path), DETECTION_DECODE)
+
+
+def prefetch_images(image_paths: List[Path], pool: ThreadPoolExecutor,
+                    load: Callable[[Path], Any] = read_image,
+                    depth: int = PREFETCH_DEPTH) -> Iterator[Tuple[Path, Future]]:
+    """Yield (path, load future) pairs in order, keeping depth loads in flight."""
+    pending = deque()
+    paths = iter(image_paths)
+    for image_path in islice(paths, depth):
+        pending.append((image_path, pool.submit(load, image_path)))
+    
+    while pending:
+        image_path, future = pending.popleft()
+        next_path = next(paths, None)
+        if next_path is not None:
+            pending.append((next_path, pool.submit(load, next_path)))
+        yield image_path, future
+
+
+def find_images(input_dir: Path, extensions: List[str]) -> List[Path]:
+    """List image files in input_dir with one directory scan, matching extensions case-insensitively."""
+    suffixes = {'.' + ext.lower().lstrip('.') for ext in extensions}
+    groups = list_by_suffix(input_dir, sorted(suffixes), ignore_case=True)
+    return [path for paths in groups.values() for path in paths]
+
+
+def get_jpeg_dimensions(path: Path) -> Optional[Tuple[int, int]]:
+    """Read (height, width) from a JPEG's SOF header without decoding it.
+    
+    Returns:
+        The dimensions, or None if the file is not a JPEG or has no readable frame header
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read(2) != b'\xff\xd8':
+                return None
+            # Walk the marker segments up to the first start-of-frame; EXIF and
+            # thumbnails in APPn segments are skipped over rather than read
+            while True:
+                byte = f.read(1)
+                if byte != b'\xff':
+                    return None
+                marker = f.read(1)
+                while marker == b'\xff':  # fill bytes
+                    marker = f.read(1)
+                if not marker:
+                    return None
+                code = marker[0]
+                if code == 0x01 or 0xD0 <= code <= 0xD7:  # standalone markers
+                    continue
+                header = f.read(2)
+                if len(header) < 2:
+                    return None
+                length = struct.unpack('>H', header)[0]
+                # SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+                if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                    frame = f.read(5)
+                    if len(frame) < 5:
+                        return None
+                    _, height, width = struct.unpack('>BHH', frame)
+                    return height, width
+                if code == 0xDA:  # start of scan without a frame header
+                    return None
+                f.seek(length - 2, os.SEEK_CUR)
+    except OSError:
+        return None
+
+
+def is_croppable_size(image_path: Path) -> bool:
+    """Reject images too small or too elongated to hold a usable face, judged from the header alone."""
+    dimensions = get_jpeg_dimensions(image_path)
+    if not dimensions or not all(dimensions):
+        # Not a JPEG (or an unusual one): leave it to the decoder
+        return True
+    short_edge, long_edge = sorted(dimensions)
+    return short_edge >= MIN_SHORT_EDGE and long_edge <= short_edge * MAX_ASPECT_RATIO
+
+
+def to_mp_image(image_bgr: np.ndarray) -> mp.Image:
+    """Wrap an already-decoded BGR image as an RGB MediaPipe image."""
+    # mp.Image copies the pixels it is given, so one RGB buffer per shape is
+    # converted into over and over instead of allocating a frame per call
+    rgb = _rgb_buffers.get(image_bgr.shape)
+    if rgb is None:
+        if len(_rgb_buffers) >= RGB_BUFFER_SHAPES:
+            _rgb_buffers.clear()
+        rgb = _rgb_buffers[image_bgr.shape] = np.empty_like(image_bgr, order='C')
+    cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+    return mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+
+
+def to_detection_image(image_bgr: np.ndarray, max_dim: int = DETECTION_MAX_DIM) -> Tuple[mp.Image, float]:
+    """Wrap a BGR image for MediaPipe, downscaled so its longest side is at most max_dim.
+    
+    Returns:
+        The MediaPipe image and the scale applied (1.0 when no resize was needed)
+    """
+    height, width = image_bgr.shape[:2]
+    scale = max_dim / max(height, width)
+    if scale < 1.0:
+        image_bgr = cv2.resize(image_bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    else:
+        scale = 1.0
+    
+    return to_mp_image(image_bgr), scale
+
+
+def rescale_detections(detection_result, scale: float):
+    """Map bounding boxes detected on a downscaled image back to original pixels."""
+    if scale == 1.0:
+        return
+    
+    # Keypoints are normalized, so only the pixel-space boxes need rescaling
+    inverse = 1.0 / scale
+    for detection in detection_result.detections:
+        bbox = detection.bounding_box
+        bbox.origin_x = int(round(bbox.origin_x * inverse))
+        bbox.origin_y = int(round(bbox.origin_y * inverse))
+        bbox.width = int(round(bbox.width * inverse))
+        bbox.height = int(round(bbox.height * inverse))
+
+
+def detections_to_array(detections) -> np.ndarray:
+    """Flatten detections once into an (N, 5) array: origin_x, origin_y, width, height, score."""
+    return np.array([[d.bounding_box.origin_x, d.bounding_box.origin_y,
+                      d.bounding_box.width, d.bounding_box.height,
+                      d.categories[0].score if d.categories else 0.0] for d in detections],
+                    dtype=np.float64).reshape(-1, 5)
+
+
+def encode_params(path: str, jpeg_quality: int = JPEG_QUALITY) -> List[int]:
+    """cv2.imwrite parameters for an output path, chosen by its extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jpg', '.jpeg'):
+        return [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality,
+                cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+    if ext == '.png':
+        # Fast deflate; crops are small and rewritten on every run
+        return [cv2.IMWRITE_PNG_COMPRESSION, 1]
+    return []
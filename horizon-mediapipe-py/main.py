@@ -5,21 +5,34 @@ import cv2
 import numpy as np
 from mediapipe import solutions
 from mediapipe.framework.formats import landmark_pb2
+import functools
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
 
+import golden
+from common import dumps_json
+from image_utils import prefetch_images
+
+LANDMARK_FIELDS = ("x", "y", "z", "visibility", "presence")
+BLENDSHAPE_FIELDS = ("index", "score", "category_name")
+SUPPORTED_FORMATS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'})
+DECODE_THREADS = 2  # images decoded ahead of detection
+
 def draw_landmarks_on_image(rgb_image, detection_result):
     face_landmarks_list = detection_result.face_landmarks
-    annotated_image = cv2.cvtColor(np.copy(rgb_image), cv2.COLOR_RGB2BGR)
+    # cvtColor writes a new buffer, so the (read-only) input needs no copy first
+    annotated_image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
 
     for idx in range(len(face_landmarks_list)):
         face_landmarks = face_landmarks_list[idx]
 
         face_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
-        face_landmarks_proto.landmark.extend([
-            landmark_pb2.NormalizedLandmark(x=landmark.x, y=landmark.y, z=landmark.z) for landmark in face_landmarks
-        ])
+        # add() builds each entry in place; extend() would copy in a standalone message per landmark
+        add_landmark = face_landmarks_proto.landmark.add
+        for landmark in face_landmarks:
+            add_landmark(x=landmark.x, y=landmark.y, z=landmark.z)
 
         solutions.drawing_utils.draw_landmarks(
             image=annotated_image,
@@ -45,6 +58,31 @@ def draw_landmarks_on_image(rgb_image, detection_result):
 
     return annotated_image
 
+def landmarks_to_array(face_landmarks):
+    # (N, 5) float32 rows of LANDMARK_FIELDS; unset or unsupported fields become NaN
+    coords = np.full((len(face_landmarks), len(LANDMARK_FIELDS)), np.nan, dtype=np.float32)
+    if len(face_landmarks):
+        # Check the landmark type once instead of per landmark
+        columns = [i for i, name in enumerate(LANDMARK_FIELDS) if hasattr(face_landmarks[0], name)]
+        getter = attrgetter(*(LANDMARK_FIELDS[i] for i in columns))
+        coords[:, columns] = np.array([getter(landmark) for landmark in face_landmarks], dtype=np.float32)
+    return coords
+
+def landmarks_array_to_dicts(coords):
+    rows = coords.tolist()
+    if np.isnan(coords).any():
+        # Unset fields are written as null, as before
+        rows = [[None if value != value else value for value in row] for row in rows]
+    return [dict(zip(LANDMARK_FIELDS, row)) for row in rows]
+
+def blendshapes_to_dicts(blendshapes):
+    # Check the category type once instead of per blendshape
+    if hasattr(next(iter(blendshapes), None), 'category_name'):
+        rows = map(attrgetter(*BLENDSHAPE_FIELDS), blendshapes)
+    else:
+        rows = ((blendshape.index, blendshape.score, None) for blendshape in blendshapes)
+    return [dict(zip(BLENDSHAPE_FIELDS, row)) for row in rows]
+
 def save_landmarks_data(detection_result, filepath):
     landmarks_data = {
         "face_landmarks": [],
@@ -53,54 +91,48 @@ def save_landmarks_data(detection_result, filepath):
     }
     
     for face_landmarks in detection_result.face_landmarks:
-        face_data = []
-        for landmark in face_landmarks:
-            face_data.append({
-                "x": landmark.x,
-                "y": landmark.y,
-                "z": landmark.z,
-                "visibility": landmark.visibility if hasattr(landmark, 'visibility') else None,
-                "presence": landmark.presence if hasattr(landmark, 'presence') else None
-            })
-        landmarks_data["face_landmarks"].append(face_data)
+        coords = landmarks_to_array(face_landmarks)
+        landmarks_data["face_landmarks"].append(landmarks_array_to_dicts(coords))
     
     if detection_result.face_blendshapes:
         for blendshapes in detection_result.face_blendshapes:
-            blendshapes_data = []
-            for blendshape in blendshapes:
-                blendshapes_data.append({
-                    "index": blendshape.index,
-                    "score": blendshape.score,
-                    "category_name": blendshape.category_name if hasattr(blendshape, 'category_name') else None
-                })
-            landmarks_data["face_blendshapes"].append(blendshapes_data)
+            landmarks_data["face_blendshapes"].append(blendshapes_to_dicts(blendshapes))
     
     if detection_result.facial_transformation_matrixes:
         for matrix in detection_result.facial_transformation_matrixes:
             landmarks_data["facial_transformation_matrixes"].append(matrix.tolist() if hasattr(matrix, 'tolist') else str(matrix))
     
-    with open(filepath, 'w') as f:
-        json.dump(landmarks_data, f, indent=2)
+    Path(filepath).write_bytes(dumps_json(landmarks_data, compact=True))
+    # Binary copy of the first face, which golden.py loads without parsing the JSON
+    golden.save_landmark_sidecar(filepath, landmarks_data)
 
-def process_images():
-    os.makedirs('input', exist_ok=True)
-    os.makedirs('output', exist_ok=True)
-    os.makedirs('landmarks', exist_ok=True)
-    
+def load_image(image_path):
+    return mp.Image.create_from_file(str(image_path))
+
+@functools.lru_cache(maxsize=1)
+def get_detector():
+    # Built once per process: loading the model and graph takes hundreds of ms,
+    # and IMAGE mode keeps no state between detect() calls. Left open until exit;
+    # an atexit close() fails once the task's own dispatcher has shut down
     base_options = python.BaseOptions(model_asset_path='face_landmarker_v2_with_blendshapes.task')
     options = vision.FaceLandmarkerOptions(base_options=base_options,
                                            output_face_blendshapes=True,
                                            output_facial_transformation_matrixes=True,
                                            num_faces=1)
-    detector = vision.FaceLandmarker.create_from_options(options)
+    return vision.FaceLandmarker.create_from_options(options)
+
+def process_images():
+    os.makedirs('input', exist_ok=True)
+    os.makedirs('output', exist_ok=True)
+    os.makedirs('landmarks', exist_ok=True)
     
-    supported_formats = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp')
+    detector = get_detector()
     
     input_dir = Path('input')
     output_dir = Path('output')
     landmarks_dir = Path('landmarks')
     
-    image_files = [f for f in input_dir.iterdir() if f.suffix.lower() in supported_formats]
+    image_files = [f for f in input_dir.iterdir() if f.suffix.lower() in SUPPORTED_FORMATS]
     
     if not image_files:
         print("No image files found in input directory")
@@ -108,30 +140,33 @@ def process_images():
     
     print(f"Found {len(image_files)} image(s) to process")
     
-    for image_path in image_files:
-        print(f"Processing: {image_path.name}")
-        
-        try:
-            image = mp.Image.create_from_file(str(image_path))
+    # Images are decoded ahead on worker threads; the detector stays on this
+    # thread (MediaPipe tasks are not thread-safe)
+    with ThreadPoolExecutor(max_workers=DECODE_THREADS) as decode_pool:
+        for image_path, decoded in prefetch_images(image_files, decode_pool, load_image):
+            print(f"Processing: {image_path.name}")
             
-            detection_result = detector.detect(image)
-            
-            if detection_result.face_landmarks:
-                annotated_image = draw_landmarks_on_image(image.numpy_view(), detection_result)
-                
-                output_path = output_dir / image_path.name
-                cv2.imwrite(str(output_path), annotated_image)
-                print(f"  Saved annotated image: {output_path}")
+            try:
+                image = decoded.result()
                 
-                landmarks_filename = f"{image_path.name}.landmark"
-                landmarks_path = landmarks_dir / landmarks_filename
-                save_landmarks_data(detection_result, str(landmarks_path))
-                print(f"  Saved landmarks data: {landmarks_path}")
-            else:
-                print(f"  No faces detected in {image_path.name}")
+                detection_result = detector.detect(image)
                 
-        except Exception as e:
-            print(f"  Error processing {image_path.name}: {str(e)}")
+                if detection_result.face_landmarks:
+                    annotated_image = draw_landmarks_on_image(image.numpy_view(), detection_result)
+                    
+                    output_path = output_dir / image_path.name
+                    cv2.imwrite(str(output_path), annotated_image)
+                    print(f"  Saved annotated image: {output_path}")
+                    
+                    landmarks_filename = f"{image_path.name}.landmark"
+                    landmarks_path = landmarks_dir / landmarks_filename
+                    save_landmarks_data(detection_result, str(landmarks_path))
+                    print(f"  Saved landmarks data: {landmarks_path}")
+                else:
+                    print(f"  No faces detected in {image_path.name}")
+                    
+            except Exception as e:
+                print(f"  Error processing {image_path.name}: {str(e)}")
     
     print("Processing complete!")
 
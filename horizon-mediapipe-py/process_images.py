@@ -4,11 +4,14 @@ Complete pipeline to process images through MediaPipe Face Mesh
 and generate golden ratio analysis with human-friendly interpretations.
 """
 
+import atexit
 import cv2
+import functools
 import mediapipe as mp
 import json
-import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, List, Optional
 import numpy as np
@@ -16,33 +19,74 @@ import numpy as np
 # Import our analysis modules
 import golden
 import golden_final
+from common import dumps_json, list_by_suffix
+from image_utils import RGB_BUFFER_SHAPES, prefetch_images
+
+# Landmark fields written to .landmark files, with the value used when the
+# landmark type does not carry the field
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility', 'presence')
+LANDMARK_DEFAULTS = (0.0, 0.0, 0.0, 0.0, 1.0)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.webp'})  # default for process_directory
+DECODE_THREADS = 2  # images decoded ahead of detection
+
+
+@functools.lru_cache(maxsize=1)
+def _get_face_mesh():
+    """Create the MediaPipe Face Mesh graph on first use and share it for the rest of the process."""
+    face_mesh = mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=True,
+        max_num_faces=1,
+        refine_landmarks=True,  # Include iris landmarks
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+    # Shared by every processor, so it is closed once at exit rather than by any one of them
+    atexit.register(face_mesh.close)
+    return face_mesh
 
 
 class FaceImageProcessor:
     def __init__(self, output_dir: str = "landmarks"):
         """Initialize MediaPipe Face Mesh processor."""
         self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            static_image_mode=True,
-            max_num_faces=1,
-            refine_landmarks=True,  # Include iris landmarks
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # Graph setup and model loading take hundreds of ms; static_image_mode
+        # keeps no state between images, so one graph serves every processor
+        self.face_mesh = _get_face_mesh()
+        # RGB conversion targets, one per image shape (see process_image)
+        self._rgb_buffers = {}
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+    
+    def __enter__(self) -> 'FaceImageProcessor':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release this processor's hold on the Face Mesh graph (the shared graph is closed at exit)."""
+        self.face_mesh = None
+        self._rgb_buffers.clear()
         
-    def process_image(self, image_path: str) -> Optional[Dict]:
-        """Process a single image to extract face landmarks."""
+    def process_image(self, image_path: str, image: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """Process a single image to extract face landmarks (image: already decoded BGR pixels, if any)."""
         try:
             # Read image
-            image = cv2.imread(image_path)
+            if image is None:
+                image = cv2.imread(image_path)
             if image is None:
                 print(f"  ✗ Could not read image: {image_path}")
                 return None
             
-            # Convert BGR to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            # Convert BGR to RGB; Face Mesh copies the frame into its graph input
+            # and returns before process() does, so one buffer per shape is
+            # converted into over and over instead of allocating a frame per image
+            image_rgb = self._rgb_buffers.get(image.shape)
+            if image_rgb is None:
+                if len(self._rgb_buffers) >= RGB_BUFFER_SHAPES:
+                    self._rgb_buffers.clear()
+                image_rgb = self._rgb_buffers[image.shape] = np.empty_like(image, order='C')
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image_rgb)
             
             # Process with MediaPipe
             results = self.face_mesh.process(image_rgb)
@@ -55,24 +99,19 @@ class FaceImageProcessor:
             face_landmarks = results.multi_face_landmarks[0]
             
             # Convert to list of dictionaries
-            landmarks_list = []
-            for landmark in face_landmarks.landmark:
-                landmarks_list.append({
-                    'x': landmark.x,
-                    'y': landmark.y,
-                    'z': landmark.z,
-                    'visibility': landmark.visibility if hasattr(landmark, 'visibility') else 0.0,
-                    'presence': landmark.presence if hasattr(landmark, 'presence') else 1.0
-                })
+            coords = self._landmarks_to_array(face_landmarks.landmark)
+            landmarks_list = [dict(zip(LANDMARK_FIELDS, row)) for row in coords.tolist()]
             
             # Get blendshapes if available
             blendshapes_list = []
             if results.multi_face_blendshapes:
-                for blendshape in results.multi_face_blendshapes[0]:
-                    blendshapes_list.append({
-                        'category_name': blendshape.category_name if hasattr(blendshape, 'category_name') else str(blendshape.index),
-                        'score': blendshape.score
-                    })
+                blendshapes = results.multi_face_blendshapes[0]
+                # Check the category type once instead of per blendshape
+                if hasattr(next(iter(blendshapes), None), 'category_name'):
+                    rows = map(attrgetter('category_name', 'score'), blendshapes)
+                else:
+                    rows = ((str(blendshape.index), blendshape.score) for blendshape in blendshapes)
+                blendshapes_list = [{'category_name': name, 'score': score} for name, score in rows]
             
             return {
                 'face_landmarks': [landmarks_list],
@@ -86,28 +125,38 @@ class FaceImageProcessor:
             print(f"  ✗ Error processing {image_path}: {str(e)}")
             return None
     
+    @staticmethod
+    def _landmarks_to_array(landmarks) -> np.ndarray:
+        """Pull landmark fields into one (N, 5) float32 array, one row per landmark."""
+        coords = np.tile(np.array(LANDMARK_DEFAULTS, dtype=np.float32), (len(landmarks), 1))
+        if len(landmarks):
+            # Check the landmark type once instead of per landmark
+            columns = [i for i, name in enumerate(LANDMARK_FIELDS) if hasattr(landmarks[0], name)]
+            getter = attrgetter(*(LANDMARK_FIELDS[i] for i in columns))
+            coords[:, columns] = np.array([getter(landmark) for landmark in landmarks], dtype=np.float32)
+        return coords
+    
     def save_landmarks(self, landmarks_data: Dict, image_name: str) -> str:
         """Save landmarks to JSON file."""
         output_path = self.output_dir / f"{image_name}.landmark"
-        with open(output_path, 'w') as f:
-            json.dump(landmarks_data, f, indent=2)
+        # Compact: landmark files are read by golden.py, not people
+        output_path.write_bytes(dumps_json(landmarks_data, compact=True))
+        # Binary copy of the face for golden.py, which then skips parsing the JSON
+        golden.save_landmark_sidecar(str(output_path), landmarks_data)
         return str(output_path)
     
     def process_directory(self, input_dir: str, extensions: List[str] = None):
         """Process all images in a directory."""
-        if extensions is None:
-            extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.webp']
-        
         input_path = Path(input_dir)
         if not input_path.exists():
             print(f"Input directory does not exist: {input_dir}")
             return
         
-        # Find all image files
-        image_files = []
-        for ext in extensions:
-            image_files.extend(input_path.glob(f"*{ext}"))
-            image_files.extend(input_path.glob(f"*{ext.upper()}"))
+        # Find all image files in one directory scan, matching extensions
+        # case-insensitively
+        suffixes = IMAGE_EXTENSIONS if extensions is None else {ext.lower() for ext in extensions}
+        groups = list_by_suffix(input_path, sorted(suffixes), ignore_case=True)
+        image_files = [path for paths in groups.values() for path in paths]
         
         if not image_files:
             print(f"No image files found in {input_dir}")
@@ -116,29 +165,26 @@ class FaceImageProcessor:
         print(f"Found {len(image_files)} images to process")
         print("=" * 50)
         
-        # Process each image
+        # Process each image; decoding runs ahead on worker threads while
+        # Face Mesh stays on this thread (it is not thread-safe)
         successful = 0
-        for image_file in image_files:
-            print(f"Processing {image_file.name}...")
-            
-            # Extract landmarks
-            landmarks_data = self.process_image(str(image_file))
-            
-            if landmarks_data:
-                # Save landmarks
-                landmark_file = self.save_landmarks(landmarks_data, image_file.stem)
-                print(f"  ✓ Saved landmarks to {Path(landmark_file).name}")
-                successful += 1
+        with ThreadPoolExecutor(max_workers=DECODE_THREADS) as decode_pool:
+            for image_file, decoded in prefetch_images(image_files, decode_pool):
+                print(f"Processing {image_file.name}...")
+                
+                # Extract landmarks
+                landmarks_data = self.process_image(str(image_file), decoded.result())
+                
+                if landmarks_data:
+                    # Save landmarks
+                    landmark_file = self.save_landmarks(landmarks_data, image_file.stem)
+                    print(f"  ✓ Saved landmarks to {Path(landmark_file).name}")
+                    successful += 1
         
         print("=" * 50)
         print(f"Successfully processed {successful}/{len(image_files)} images")
         
         return successful > 0
-    
-    def __del__(self):
-        """Clean up MediaPipe resources."""
-        if hasattr(self, 'face_mesh'):
-            self.face_mesh.close()
 
 
 def run_complete_pipeline(input_dir: str = "images", output_dir: str = "landmarks"):
@@ -155,8 +201,8 @@ def run_complete_pipeline(input_dir: str = "images", output_dir: str = "landmark
     # Step 1: Process images
     print("\nStep 1: Extracting MediaPipe Face Landmarks")
     print("-" * 50)
-    processor = FaceImageProcessor(output_dir)
-    success = processor.process_directory(input_dir)
+    with FaceImageProcessor(output_dir) as processor:
+        success = processor.process_directory(input_dir)
     
     if not success:
         print("\nNo images were successfully processed. Exiting.")
@@ -224,30 +270,27 @@ def main():
     if args.single:
         # Process single image
         print(f"Processing single image: {args.single}")
-        processor = FaceImageProcessor(args.output)
-        
-        landmarks_data = processor.process_image(args.single)
-        if landmarks_data:
-            image_name = Path(args.single).stem
-            landmark_file = processor.save_landmarks(landmarks_data, image_name)
-            print(f"✓ Saved landmarks to {landmark_file}")
-            
-            # Run golden ratio analysis on this file
-            print("\nRunning golden ratio analysis...")
-            result = golden.process_landmark_file(landmark_file)
-            golden_file = landmark_file.replace('.landmark', '.golden.json')
-            with open(golden_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            # Generate human-friendly interpretation
-            print("Generating human-friendly interpretation...")
-            final_result = golden_final.process_golden_file(golden_file)
-            final_file = golden_file.replace('.golden.json', '.golden.final.json')
-            with open(final_file, 'w') as f:
-                json.dump(final_result, f, indent=2)
-            
-            print(f"\n✓ Analysis complete!")
-            print(f"  Results: {final_file}")
+        with FaceImageProcessor(args.output) as processor:
+            landmarks_data = processor.process_image(args.single)
+            if landmarks_data:
+                image_name = Path(args.single).stem
+                landmark_file = processor.save_landmarks(landmarks_data, image_name)
+                print(f"✓ Saved landmarks to {landmark_file}")
+                
+                # Run golden ratio analysis on this file
+                print("\nRunning golden ratio analysis...")
+                result = golden.process_landmark_file(landmark_file)
+                golden_file = landmark_file.replace('.landmark', '.golden.json')
+                Path(golden_file).write_bytes(dumps_json(result, compact=True))
+                
+                # Generate human-friendly interpretation
+                print("Generating human-friendly interpretation...")
+                final_result = golden_final.process_golden_file(Path(golden_file))
+                final_file = golden_file.replace('.golden.json', '.golden.final.json')
+                Path(final_file).write_bytes(dumps_json(final_result))
+                
+                print(f"\n✓ Analysis complete!")
+                print(f"  Results: {final_file}")
     else:
         # Process directory
         run_complete_pipeline(args.input_dir, args.output)
@@ -7,22 +7,32 @@ This script processes .landmark files through the complete analysis pipeline.
 import json
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Import our analysis modules
 import golden
+from common import list_by_suffix
 import importlib.util
 
 # Load golden.final module
 spec = importlib.util.spec_from_file_location("golden_final", "golden.final.py")
 golden_final = importlib.util.module_from_spec(spec)
+# Registered so its worker processes can find the module's functions
+sys.modules[spec.name] = golden_final
 spec.loader.exec_module(golden_final)
 
 
-def run_analysis_pipeline(landmarks_dir: str = "landmarks"):
+# Landmark-directory outputs, longest suffix first so each file lands in one group
+LANDMARK_SUFFIXES = ('.golden.final.json', '.golden.json', '.landmark')
+
+
+def run_analysis_pipeline(landmarks_dir: str = "landmarks", compare: bool = False):
     """
     Run the analysis pipeline on existing landmark files:
     1. Run golden ratio analysis
     2. Generate human-friendly interpretations
+    
+    With compare, finish with compare_results on the generated interpretations.
     """
     print("=" * 60)
     print("GOLDEN RATIO ANALYSIS PIPELINE")
@@ -34,7 +44,7 @@ def run_analysis_pipeline(landmarks_dir: str = "landmarks"):
         return False
     
     # Check for landmark files
-    landmark_files = list(landmark_path.glob("*.landmark"))
+    landmark_files = list_by_suffix(landmark_path, LANDMARK_SUFFIXES)['.landmark']
     if not landmark_files:
         print(f"No .landmark files found in {landmarks_dir}")
         return False
@@ -55,9 +65,10 @@ def run_analysis_pipeline(landmarks_dir: str = "landmarks"):
     print("ANALYSIS COMPLETE")
     print("=" * 60)
     
-    # Print summary
-    golden_files = list(landmark_path.glob("*.golden.json"))
-    final_files = list(landmark_path.glob("*.golden.final.json"))
+    # Print summary (one rescan picks up both kinds of generated file)
+    generated = list_by_suffix(landmark_path, LANDMARK_SUFFIXES)
+    golden_files = generated['.golden.json']
+    final_files = generated['.golden.final.json']
     
     print(f"\nGenerated files:")
     print(f"  - {len(golden_files)} golden ratio analyses")
@@ -89,13 +100,16 @@ def run_analysis_pipeline(landmarks_dir: str = "landmarks"):
         except:
             pass
     
+    if compare:
+        compare_results(landmarks_dir, final_files)
+    
     return True
 
 
-def compare_results(landmarks_dir: str = "landmarks"):
-    """Compare golden ratio scores across all analyzed faces."""
-    landmark_path = Path(landmarks_dir)
-    final_files = list(landmark_path.glob("*.golden.final.json"))
+def compare_results(landmarks_dir: str = "landmarks", final_files: Optional[List[Path]] = None):
+    """Compare golden ratio scores across all analyzed faces (final_files: already listed .golden.final.json files)."""
+    if final_files is None:
+        final_files = list_by_suffix(landmarks_dir, LANDMARK_SUFFIXES)['.golden.final.json']
     
     if not final_files:
         print("No final analysis files found")
@@ -163,12 +177,8 @@ def main():
     
     args = parser.parse_args()
     
-    # Run analysis
-    success = run_analysis_pipeline(args.landmarks_dir)
-    
-    # Show comparison if requested
-    if success and args.compare:
-        compare_results(args.landmarks_dir)
+    # Run analysis, showing the comparison if requested
+    run_analysis_pipeline(args.landmarks_dir, compare=args.compare)
 
 
 if __name__ == "__main__":